@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Callable, Optional, Awaitable
 
 import ccxt.pro as ccxt
 
 from state import DataState
 from ohlcv_io import convert_timeframe, make_ccxt_pro_client
+from pynecore.core.realtime_timeframe import parse_tf
 from exchange_clock import release_exchange_clock, retain_exchange_clock
 
 
@@ -17,24 +19,50 @@ async def _safe_close(ex) -> None:
         pass
 
 
+def _build_bars(ex, state: DataState, tf: str, since: int) -> Optional[list]:
+    """
+    Re-aggregate the collected trades and merge the result into state.live_bars.
+    Must be called with state.lock held.
+
+    :return: The last bar that was updated or appended, None if nothing changed
+    """
+    state.trade_batch_counter = 0
+    state.last_build_ns = time.monotonic_ns()
+    generated = ex.build_ohlcvc(state.collected_trades, tf, since)
+
+    bars = state.live_bars
+    bar_to_push = None
+    for bar in generated:
+        ts = bar[0]
+        last_ts = bars[-1][0] if bars else 0
+
+        if ts == last_ts:
+            bars[-1] = bar
+            bar_to_push = bar
+        elif ts > last_ts:
+            bars.append(bar)
+            state.collected_trades = ex.filter_by_since_limit(state.collected_trades, ts)
+            bar_to_push = bar
+    return bar_to_push
+
+
 async def watch_trades_loop(
     exchange_name: str,
     symbol: str,
     timeframe: str,
     state: DataState,
     on_bar: Callable[[list], Awaitable[None]],
+    build_every_trades: int = 32,
+    build_every_ns: int = 50_000_000,
 ) -> None:
     ex = make_ccxt_pro_client(ccxt, exchange_name)
 
     tf = timeframe
-    tf_modifier = tf[-1]
-    tf_value = int(tf[:-1])
-    if tf_modifier == "h":
-        tf_multiplier = tf_value * 60
-    else:
-        tf_multiplier = tf_value
+    tf_ms = parse_tf(tf).ms
+    since = ex.milliseconds() - tf_ms
 
-    since = ex.milliseconds() - int(tf_multiplier) * 60 * 1000
+    # ex is replaced on reconnect, the closure always builds with the current client
+    state.build_pending_trades = lambda: _build_bars(ex, state, tf, since)
 
     try:
         while True:
@@ -44,20 +72,26 @@ async def watch_trades_loop(
 
                 async with state.lock:
                     state.collected_trades.extend(ws_trades)
-                    generated = ex.build_ohlcvc(state.collected_trades, tf, since)
+                    state.trade_batch_counter += len(ws_trades)
                     bars = state.live_bars
 
-                    for bar in generated:
-                        ts = bar[0]
-                        last_ts = bars[-1][0] if bars else 0
-
-                        if ts == last_ts:
-                            bars[-1] = bar
-                            bar_to_push = bar
-                        elif ts > last_ts:
-                            bars.append(bar)
-                            state.collected_trades = ex.filter_by_since_limit(state.collected_trades, ts)
-                            bar_to_push = bar
+                    # build_ohlcvc re-aggregates the whole trade buffer, so only run it every
+                    # N trades / M ns. Always build on bar rollover so the confirmed bar is
+                    # finalized from every collected trade before the new bar is appended.
+                    # Trades held back here are built by fix_missing_bars_loop if no trade
+                    # rolls the bar over (see build_pending_trades).
+                    now_ns = time.monotonic_ns()
+                    rollover = (
+                        not bars
+                        or (bool(ws_trades) and ws_trades[-1]["timestamp"] // tf_ms > bars[-1][0] // tf_ms)
+                    )
+                    if not (
+                        rollover
+                        or state.trade_batch_counter >= build_every_trades
+                        or now_ns - state.last_build_ns > build_every_ns
+                    ):
+                        continue
+                    bar_to_push = _build_bars(ex, state, tf, since)
 
                 if bar_to_push is not None:
                     await on_bar(bar_to_push)
@@ -69,6 +103,7 @@ async def watch_trades_loop(
                 await _safe_close(ex)
                 ex = make_ccxt_pro_client(ccxt, exchange_name)
     finally:
+        state.build_pending_trades = None
         await _safe_close(ex)
 
 
@@ -76,6 +111,7 @@ async def fix_missing_bars_loop(
     exchange_name: str,
     timeframe: str,
     state: DataState,
+    on_bar: Optional[Callable[[list], Awaitable[None]]] = None,
     check_interval_sec: float = 0.1,
     time_sync_interval_sec: float = 30.0,
 ) -> None:
@@ -92,12 +128,20 @@ async def fix_missing_bars_loop(
             now_ms = await clock.now_ms()
 
             missing_ts: Optional[int] = None
+            built_bar: Optional[list] = None
 
             async with state.lock:
                 bars = state.live_bars
                 if len(bars) < 1:
                     continue
 
+                # Trades held back by the build throttle are built here on the timer when no
+                # later trade frame came. This must happen before a fake bar is appended,
+                # otherwise the confirmed bar is written without its last trades.
+                if state.trade_batch_counter > 0 and state.build_pending_trades is not None:
+                    built_bar = state.build_pending_trades()
+                    bars = state.live_bars
+
                 last_open_ts = bars[-1][0]
                 expected = last_open_ts + tf_ms
 
@@ -106,15 +150,16 @@ async def fix_missing_bars_loop(
                     if (not has_next) and (state.last_fix_bar_ts != expected):
                         missing_ts = expected
 
-                if missing_ts is None:
-                    continue
-
-                prev_close = bars[-1][4]
-                # No trades occurred in this interval. Store the placeholder as true 0-volume.
-                # OKX/Binance policy will hide it; BITGET/Hyperliquid still treat it as visible.
-                fake = [missing_ts, prev_close, prev_close, prev_close, prev_close, 0.0]
-                bars.append(fake)
-                # print(f"[fix_missing_bars_loop] {exchange_name} bar: {fake}")
-                state.last_fix_bar_ts = missing_ts
+                if missing_ts is not None:
+                    prev_close = bars[-1][4]
+                    # No trades occurred in this interval. Store the placeholder as true 0-volume.
+                    # OKX/Binance policy will hide it; BITGET/Hyperliquid still treat it as visible.
+                    fake = [missing_ts, prev_close, prev_close, prev_close, prev_close, 0.0]
+                    bars.append(fake)
+                    # print(f"[fix_missing_bars_loop] {exchange_name} bar: {fake}")
+                    state.last_fix_bar_ts = missing_ts
+
+            if built_bar is not None and on_bar is not None:
+                await on_bar(built_bar)
     finally:
         await release_exchange_clock(exchange_name)
@@ -11,12 +11,14 @@ from config import FeedSpec
 from pynecore.cli.commands.data import parse_date_or_days
 from pynecore.core.ohlcv_file import OHLCVReader
 from pynecore.cli.app import app_state
+from pynecore.core.realtime_timeframe import parse_tf
 from ohlcv_io import (
     convert_timeframe,
     download_history,
     fix_last_open_if_needed,
     fetch_and_update_ohlcv_data,
     fetch_and_update_recent_ohlcv_data,
+    read_tail_records,
     download_history_range_into_cache,
     update_ohlcv_data,
 )
@@ -89,12 +91,14 @@ async def file_update_loop(
         except Exception:
             desired_dt = None
     else:
-        tf_modifier = timeframe[-1]
-        tf_value = int(timeframe[:-1])
-        month_ago = 1 if tf_modifier == "m" and tf_value == 1 else 2
+        tf_spec = parse_tf(timeframe)
+        month_ago = 1 if tf_spec.unit == "m" and tf_spec.value == 1 else 2
         desired_dt = (datetime.now(UTC) - relativedelta(months=month_ago)).replace(second=0, microsecond=0)
 
-    if ohlcv_path.exists() and desired_dt is not None:
+    # The .ohlcv file only appears/disappears through this loop (export, download,
+    # unlink), so track its existence here instead of stat-ing it on every poll.
+    ohlcv_exists = ohlcv_path.exists()
+    if ohlcv_exists and desired_dt is not None:
         with OHLCVReader(ohlcv_path) as reader:
             start_ts = reader.start_timestamp
             reader.close()
@@ -182,7 +186,8 @@ async def file_update_loop(
             )
         else:
             export_to_ohlcv(cache_path, provider, exchange, symbol, timeframe, ohlcv_path)
-        if ohlcv_path.exists():
+        ohlcv_exists = ohlcv_path.exists()
+        if ohlcv_exists:
             print("[data_service] ohlcv regenerated from sqlite cache")
             history_download_complete = True
             state.pending_prerun_event = {
@@ -194,13 +199,14 @@ async def file_update_loop(
     if not cache_ready:
         # No cache: start history download flow.
         print("[data_service] sqlite cache missing; starting history download")
-        if ohlcv_path.exists() and history_since == "":
+        if ohlcv_exists and history_since == "":
             with OHLCVReader(ohlcv_path) as reader:
                 start_timestamp = reader.start_timestamp
                 reader.close()
         for file_path in (ohlcv_path, toml_path):
             if file_path.exists():
                 file_path.unlink()
+        ohlcv_exists = False
 
     timeframe_ms = convert_timeframe(timeframe, to_ms=True)
     pre_run_script_time = timeframe_ms / 2
@@ -223,7 +229,7 @@ async def file_update_loop(
             # fix_missing_bars_loop 가 prev_close 를 얻어 no-trade 구간에도 fake bar
             # 를 만들고 파일/전략 시계가 전진한다 (steady-state 와 동일 동작).
             # seed 가 없으면 첫 거래 전까지 live_bars 가 [] 라 file_update 가 멈춘다.
-            if history_download_complete and ohlcv_path.exists() and len(bars) == 0:
+            if history_download_complete and ohlcv_exists and len(bars) == 0:
                 try:
                     with OHLCVReader(ohlcv_path) as reader:
                         last = reader.read(reader.size - 1)
@@ -237,7 +243,7 @@ async def file_update_loop(
                     print(f"[data_service] cold-start live_bars seed skipped: {e}")
 
             # 1) file missing -> download history
-            if not ohlcv_path.exists():
+            if not ohlcv_exists:
                 # Compute since date for history download.
                 since = None
                 if start_timestamp is not None:
@@ -261,6 +267,7 @@ async def file_update_loop(
                             fp.unlink()
                     continue
                 else:
+                    ohlcv_exists = True
                     history_download_complete = True
                     first_fetch_after_download_done = False
                     import_from_ohlcv(cache_path, provider, exchange, symbol, timeframe, ohlcv_path)
@@ -283,7 +290,7 @@ async def file_update_loop(
             # 2) pre-run open fix timing
             if (
                 len(bars) == 2
-                and ohlcv_path.exists()
+                and ohlcv_exists
                 and (not open_fix_done)
                 and (datetime.now().timestamp() * 1000 >= bars[1][0] + pre_run_script_time)
             ):
@@ -366,7 +373,7 @@ async def file_update_loop(
                     )
 
             # 3) bars>=3 -> keep 2 and update file
-            if len(bars) >= 3 and ohlcv_path.exists():
+            if len(bars) >= 3 and ohlcv_exists:
                 # Apply live bars and emit run_ready if ohlcv is updated.
                 confirmed_bar_and_new_bar = bars[1:]  # confirmed, new
                 state.live_bars = confirmed_bar_and_new_bar
@@ -390,15 +397,12 @@ async def file_update_loop(
                     )
                     # SQLite cache sync
                     # print(f"[data_service] ohlcv updated from live bars; syncing sqlite cache, {confirmed_bar_and_new_bar}")
-                    with OHLCVReader(ohlcv_path) as reader:
-                        last_confirmed_bar = reader.read(reader.size - 2)
-                        last_new_bar = reader.read(reader.size - 1)
-                        cache_rows = []
-                        for cd in [last_confirmed_bar, last_new_bar]:
-                            cache_rows.append([cd.timestamp, cd.open, cd.high, cd.low, cd.close, cd.volume])
-                        upsert_bars(cache_path, provider, exchange, symbol, timeframe, cache_rows)
-                        # print("[data_service] sqlite cache synced")
-                        reader.close()
+                    tail, _ = read_tail_records(ohlcv_path, 2)
+                    cache_rows = []
+                    for cd in tail:
+                        cache_rows.append([cd.timestamp, cd.open, cd.high, cd.low, cd.close, cd.volume])
+                    upsert_bars(cache_path, provider, exchange, symbol, timeframe, cache_rows)
+                    # print("[data_service] sqlite cache synced")
                 else:
                     print(f"Failed to update OHLCV file with bars: {confirmed_bar_and_new_bar}")
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, UTC
+import os
 import struct
 import time
 from typing import Optional
@@ -9,7 +10,8 @@ from tempfile import TemporaryDirectory
 
 from dateutil.relativedelta import relativedelta
 from pynecore.core.exchange_policy import fetch_current_open_from_exchange
-from pynecore.core.ohlcv_file import OHLCVReader, OHLCVWriter
+from pynecore.core.realtime_timeframe import parse_tf
+from pynecore.core.ohlcv_file import OHLCVReader, OHLCVWriter, RECORD_SIZE, STRUCT_FORMAT
 from pynecore.types.ohlcv import OHLCV
 from ohlcv_cache import import_from_ohlcv
 from pynecore.cli.app import app_state
@@ -23,31 +25,13 @@ def convert_timeframe(timeframe: str, to_ms: bool = False) -> int | str:
         timeframe: 시간 단위 문자열 (예: "5m", "1h", "1d")
         to_ms: True면 밀리초로, False면 분 단위 문자열로 반환
     """
-    unit = timeframe[-1]
-    value = int(timeframe[:-1])
-
-    # 먼저 분 단위로 변환
-    if unit == "m":
-        minutes = value
-    elif unit == "h":
-        minutes = value * 60
-    else:  # "d"
-        minutes = value * 24 * 60
-
-    return minutes * 60 * 1000 if to_ms else str(minutes)
+    spec = parse_tf(timeframe)
+    return spec.ms if to_ms else str(spec.minutes)
 
 
 def download_history(provider: str, exchange: str, symbol: str, timeframe: str, since: Optional[str]) -> bool:
     # pynecore download uses timeframe as minutes in numeric format
-    tf_modifier = timeframe[-1]
-    tf_value = int(timeframe[:-1])
-
-    if tf_modifier == "m":
-        data_timeframe = str(tf_value)
-    elif tf_modifier == "h":
-        data_timeframe = str(tf_value * 60)
-    else:
-        data_timeframe = timeframe
+    data_timeframe = parse_tf(timeframe).pyne_period
 
     if since is None:
         today = datetime.today()
@@ -119,6 +103,26 @@ def _ohlcv_float(value: float) -> float:
     return struct.unpack("f", struct.pack("f", value))[0]
 
 
+def read_tail_records(ohlcv_path: str | Path, n: int) -> tuple[list[OHLCV], int | None]:
+    """Read the last n records of an .ohlcv file in one read.
+
+    Cheaper than an OHLCVReader open/mmap/read-per-record round trip for the
+    boundary paths that only need the tail. Also returns the file interval
+    (second minus first timestamp), matching OHLCVReader.interval.
+    """
+    with open(ohlcv_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size // RECORD_SIZE
+        interval = None
+        if size >= 2:
+            first_ts, second_ts = struct.unpack("I20xI", f.read(RECORD_SIZE + 4))
+            interval = second_ts - first_ts
+        count = min(n, size)
+        f.seek((size - count) * RECORD_SIZE)
+        data = f.read(count * RECORD_SIZE)
+    records = [OHLCV(*rec, extra_fields={}) for rec in struct.iter_unpack(STRUCT_FORMAT, data)]
+    return records, interval
+
+
 def _filter_invalid_ccxt_markets(markets: list) -> list:
     """Drop ccxt-normalized markets that have no id/symbol.
 
@@ -207,21 +211,15 @@ def fix_last_open_if_needed(
     retry_delays = (1.0, 2.0)
     max_attempts = len(retry_delays) + 1
     fixed_candle_open_price = 0.0
-    open_price, high_price, low_price, close_price, vol, prev_close_price = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
-    last_timestamp, interval = 0, 0
-    with OHLCVReader(ohlcv_path) as reader:
-        size = reader.size
-        last = reader.read(size - 1)
-        prev = reader.read(size - 2)
-        interval = reader.interval
-        last_timestamp = last.timestamp
-        open_price = last.open
-        high_price = last.high
-        low_price = last.low
-        close_price = last.close
-        vol = last.volume
-        prev_close_price = prev.close
-        reader.close()
+    tail, interval = read_tail_records(ohlcv_path, 2)
+    prev, last = tail[-2], tail[-1]
+    last_timestamp = last.timestamp
+    open_price = last.open
+    high_price = last.high
+    low_price = last.low
+    close_price = last.close
+    vol = last.volume
+    prev_close_price = prev.close
 
     if fetch_current_open_from_exchange(exchange):
         # OKX, Binance, HYPERLIQUID 의 경우 이전 봉 종가 != 현재 봉 시가 이므로 fetch 로 현재 봉 값을 가져와야 함.
@@ -293,13 +291,9 @@ def update_ohlcv_data(ohlcv_path: str, candle_datas: list) -> int:
     candle_datas: Expected format is [confirmed_bar, new_bar]
     """
     incremental_size = 0
-    last_timestamp = 0
-    last_open_price = 0.0
-
-    with OHLCVReader(ohlcv_path) as reader:
-        last_timestamp = reader.end_timestamp
-        last_open_price = reader.read(reader.size - 1).open
-        reader.close()
+    tail, _ = read_tail_records(ohlcv_path, 1)
+    last_timestamp = tail[-1].timestamp
+    last_open_price = tail[-1].open
 
     with OHLCVWriter(ohlcv_path) as writer:
         for cd in candle_datas:
@@ -4,23 +4,13 @@ from pathlib import Path
 from typing import Tuple
 
 from pynecore.cli.app import app_state
-
-
-def _tf_key(timeframe: str) -> str:
-    tf_modifier = timeframe[-1]
-    tf_value = int(timeframe[:-1])
-    if tf_modifier == "h":
-        return str(tf_value * 60)
-    elif tf_modifier == "m":
-        return str(tf_value)
-    else:
-        return timeframe
+from pynecore.core.realtime_timeframe import parse_tf
 
 
 def make_ohlcv_paths(provider: str, exchange: str, symbol: str, timeframe: str) -> Tuple[Path, Path]:
     base = (
         f"{provider}_{exchange.upper()}_"
-        f"{symbol.upper().replace('/', ':').replace(':', '_')}_{_tf_key(timeframe)}"
+        f"{symbol.upper().replace('/', ':').replace(':', '_')}_{parse_tf(timeframe).pyne_period}"
     )
     return app_state.data_dir / f"{base}.ohlcv", app_state.data_dir / f"{base}.toml"
 
@@ -108,7 +108,7 @@ class SessionRegistry:
             asyncio.create_task(self._guard_feed(feed, "watch_trades_loop", watch_trades_loop(
                 spec.exchange, spec.symbol, spec.timeframe, feed.state, feed.broadcast_bar))),
             asyncio.create_task(self._guard_feed(feed, "fix_missing_bars_loop", fix_missing_bars_loop(
-                spec.exchange, spec.timeframe, feed.state))),
+                spec.exchange, spec.timeframe, feed.state, feed.broadcast_bar))),
             asyncio.create_task(self._guard_feed(feed, "file_update_loop", file_update_loop(
                 config=spec, ohlcv_path=feed.paths.ohlcv_path, toml_path=feed.paths.toml_path,
                 state=feed.state, emit_event=feed.emit_event))),
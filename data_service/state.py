@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 
 @dataclass
 class DataState:
     collected_trades: List[Dict[str, Any]] = field(default_factory=list)
+    # Trades collected since the last build_ohlcvc, and when it last ran (monotonic ns).
+    # A non-zero counter also means live_bars does not include every collected trade yet.
+    trade_batch_counter: int = 0
+    last_build_ns: int = 0
+    # Builds the pending trades into live_bars (call with lock held), returns the last updated bar.
+    # Set by watch_trades_loop, used by fix_missing_bars_loop before it appends a fake bar.
+    build_pending_trades: Optional[Callable[[], Optional[List[Any]]]] = None
 
     # bar = [ts_ms, open, high, low, close, volume]
     # 여기에는 미완성 바도 포함해서 시간순으로 쌓인다
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# data_service modules import each other as top-level modules (it is run from its own directory)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("ccxt.pro")
+
+import collector_loop  # noqa: E402
+from state import DataState  # noqa: E402
+
+TF = "1m"
+TF_MS = 60_000
+BAR_N = 1_700_000_040_000  # open time of bar N, aligned to the timeframe
+
+
+class FakeExchange:
+    """The subset of a ccxt.pro client used by watch_trades_loop, fed from a list of frames"""
+
+    def __init__(self, frames: list[list[dict]]):
+        self.frames = list(frames)
+
+    def milliseconds(self) -> int:
+        return BAR_N
+
+    async def watch_trades(self, symbol, since, limit, params):
+        if self.frames:
+            return self.frames.pop(0)
+        # No more trades: wait like a quiet websocket
+        await asyncio.Event().wait()
+
+    @staticmethod
+    def build_ohlcvc(trades, timeframe, since):
+        bars: dict[int, list] = {}
+        for t in trades:
+            ts = t["timestamp"] // TF_MS * TF_MS
+            price, amount = t["price"], t["amount"]
+            bar = bars.get(ts)
+            if bar is None:
+                bars[ts] = [ts, price, price, price, price, amount, 1]
+            else:
+                bar[2] = max(bar[2], price)
+                bar[3] = min(bar[3], price)
+                bar[4] = price
+                bar[5] += amount
+                bar[6] += 1
+        return [bars[ts] for ts in sorted(bars)]
+
+    @staticmethod
+    def filter_by_since_limit(trades, since):
+        return [t for t in trades if t["timestamp"] >= since]
+
+    async def close(self):
+        pass
+
+
+class FakeClock:
+    def __init__(self, now_ms: float):
+        self.now = now_ms
+
+    async def now_ms(self) -> float:
+        return self.now
+
+
+def _trade(ts: int, price: float, amount: float = 1.0) -> dict:
+    return {"timestamp": ts, "price": price, "amount": amount}
+
+
+def test_held_back_trades_are_in_the_confirmed_bar(monkeypatch):
+    # 40 trades build bar N, the last 2 trades of bar N stay under the 32 trade / 50 ms throttle,
+    # and no later frame comes to trigger a build before the bar is closed by a fake bar.
+    first_frame = [_trade(BAR_N + i * 100, 100.0 + i * 0.01) for i in range(40)]
+    last_frame = [_trade(BAR_N + 50_000, 120.0, 2.0), _trade(BAR_N + 59_000, 90.0, 3.0)]
+    exchange = FakeExchange([first_frame, last_frame])
+    clock = FakeClock(BAR_N + TF_MS + 300)
+
+    async def release_clock(name):
+        pass
+
+    monkeypatch.setattr(collector_loop, "make_ccxt_pro_client", lambda module, name: exchange)
+    monkeypatch.setattr(collector_loop, "retain_exchange_clock", lambda name, interval: clock)
+    monkeypatch.setattr(collector_loop, "release_exchange_clock", release_clock)
+
+    pushed: list[list] = []
+
+    async def on_bar(bar):
+        pushed.append(list(bar))
+
+    async def run() -> DataState:
+        state = DataState()
+        tasks = [
+            asyncio.create_task(collector_loop.watch_trades_loop(
+                "fake", "BTC/USDT", TF, state, on_bar, build_every_ns=10_000_000_000)),
+            asyncio.create_task(collector_loop.fix_missing_bars_loop(
+                "fake", TF, state, on_bar, check_interval_sec=0.01)),
+        ]
+        await asyncio.sleep(0.2)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return state
+
+    state = asyncio.run(run())
+
+    confirmed, fake = state.live_bars
+    assert confirmed[0] == BAR_N
+    assert confirmed[2] == 120.0  # high from the held back trades
+    assert confirmed[3] == 90.0  # low
+    assert confirmed[4] == 90.0  # close
+    assert confirmed[5] == pytest.approx(40 + 2.0 + 3.0)
+    # The fake bar is built from the final close of bar N
+    assert fake == [BAR_N + TF_MS, 90.0, 90.0, 90.0, 90.0, 0.0]
+    assert state.trade_batch_counter == 0
+    assert pushed[-1][4] == 90.0
@@ -3,7 +3,7 @@ from typing import Tuple
 import numpy as np
 import pandas as pd
 
-from modules.request_security import request_security, read_ohlcv_i32_f32_le
+from modules.request_security import request_security, read_ltf_frame
 
 
 # ============================================================
@@ -21,20 +21,23 @@ def bb_series(
     주어진 Series 에 대해 Bollinger Bands 를 계산한다.
     사용자가 준 bb(source, period, mult) 구현과 의미를 맞춘다.
 
-    반환: (middle, upper, lower)
+    반환: (middle, upper, lower)  -- 모두 float32
     """
     if period <= 0:
         raise AssertionError("Invalid period, period must be greater than 0!")
     if mult <= 0:
         raise AssertionError("Invalid multiplier, multiplier must be greater than 0!")
 
-    roll = source.rolling(window=period)
-    middle = roll.mean()
+    # rolling 은 내부적으로 float64 로 누적하므로 결과만 float32 로 내린다.
+    roll = source.astype(np.float32).rolling(window=period)
+    middle = roll.mean().astype(np.float32)
     ddof = 0 if biased else 1
-    std = roll.std(ddof=ddof)
+    var = roll.var(ddof=ddof)
+    std = pd.Series(np.sqrt(var.to_numpy(dtype=np.float32)), index=var.index)
 
-    upper = middle + mult * std
-    lower = middle - mult * std
+    band = np.float32(mult) * std
+    upper = middle + band
+    lower = middle - band
     return middle, upper, lower
 
 
@@ -46,7 +49,7 @@ def get_bb1d_lower(
     session_offset_hours: int = 9,
     biased: bool = True,
     lookahead_on: bool = False
-) -> float | list:
+) -> float | np.ndarray:
     """
     5분봉 OHLCV DataFrame 기준으로
     '마지막 5분봉 시점에 보이는 일봉 BB 하단값' 을 반환한다.
@@ -55,9 +58,8 @@ def get_bb1d_lower(
         request.security(timeframe="1D", lookahead=barmerge.lookahead_off)
         로 계산한 BB.lower 를 5분봉에 붙인 다음, 마지막 값을 읽는 것과 같다.
     """
-    df_5m: pd.DataFrame = read_ohlcv_i32_f32_le(data_path)
-    # 정렬 및 중복 제거
-    df_5m = df_5m[~df_5m.index.duplicated(keep="last")].sort_index()
+    # 정렬 및 중복 제거된 5분봉 (같은 파일이면 캐시 공유)
+    df_5m: pd.DataFrame = read_ltf_frame(data_path)
 
     def bb1d_lower_func(df_1d: pd.DataFrame) -> pd.Series:
         _, _, lower = bb_series(df_1d["close"], period, mult, biased=biased)
@@ -74,7 +76,5 @@ def get_bb1d_lower(
     if bb1d_lower.dropna().empty:
         return float("nan")
 
-    # 5) list[float] 로 변환
-    list_bb1d_lower = np.nan_to_num(bb1d_lower.values, nan=0.0).astype(float).tolist()
-
-    return list_bb1d_lower
+    # 5) NaN -> 0.0 변환 후 ndarray 그대로 반환 (bar_index 로 인덱싱 가능, list 변환 비용 없음)
+    return np.nan_to_num(bb1d_lower.to_numpy(dtype=np.float64), nan=0.0)
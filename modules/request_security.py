@@ -1,6 +1,8 @@
 
 # 100% AI Generated request.security mocking
 
+import os
+from functools import lru_cache
 from typing import Callable
 
 import numpy as np
@@ -22,6 +24,8 @@ def read_ohlcv_i32_f32_le(
     각 레코드:
         int32  timestamp (epoch, unit 초)
         float32 open, high, low, close, volume
+
+    가격/거래량 컬럼은 파일 정밀도 그대로 float32 로 유지한다 (float64 업캐스트 없음).
     """
     dtype = np.dtype([
         ("ts",   "<i4"),
@@ -45,11 +49,11 @@ def read_ohlcv_i32_f32_le(
 
     df = pd.DataFrame(
         {
-            "open":   arr["open"].astype(np.float64),
-            "high":   arr["high"].astype(np.float64),
-            "low":    arr["low"].astype(np.float64),
-            "close":  arr["close"].astype(np.float64),
-            "volume": arr["volume"].astype(np.float64),
+            "open":   arr["open"].astype(np.float32),
+            "high":   arr["high"].astype(np.float32),
+            "low":    arr["low"].astype(np.float32),
+            "close":  arr["close"].astype(np.float32),
+            "volume": arr["volume"].astype(np.float32),
         },
         index=idx,
     )
@@ -57,6 +61,24 @@ def read_ohlcv_i32_f32_le(
     return df
 
 
+@lru_cache(maxsize=2)
+def _read_ltf_frame(path: str, size: int, mtime_ns: int) -> pd.DataFrame:
+    df = read_ohlcv_i32_f32_le(path)
+    # 정렬 및 중복 제거
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def read_ltf_frame(path: str) -> pd.DataFrame:
+    """
+    정렬/중복 제거된 저타임프레임 OHLCV DataFrame 을 반환한다.
+
+    파일 크기와 mtime 으로 캐시하므로, 같은 봉에서 get_bb1d_lower / get_weekly_high_low 를
+    연달아 호출해도 파일은 한 번만 읽는다. 반환된 DataFrame 은 공유되므로 수정하지 않는다.
+    """
+    st = os.stat(path)
+    return _read_ltf_frame(path, st.st_size, st.st_mtime_ns)
+
+
 # ============================================================
 # 2. 타임프레임 유틸과 리샘플
 # ============================================================
@@ -179,13 +201,8 @@ def request_security(
     if not lookahead_on:
         htf_series = htf_series.shift(1)
 
-    # 6. merge_asof 로 LTF 타임스탬프에 가장 가까운 과거 HTF 값 매핑
+    # 6. LTF 타임스탬프에 가장 가까운 과거 HTF 값 매핑
     #    (주봉 W-MON 같은 anchored freq 도 안전하게 처리)
-    # LTF 쪽 준비
-    ltf_frame = pd.DataFrame(index=df_shifted.index).sort_index()
-    ltf_reset = ltf_frame.reset_index()
-    ltf_time_col = ltf_reset.columns[0]
-
     # HTF 쪽 준비
     htf_clean = htf_series.dropna().sort_index()
     if htf_clean.empty:
@@ -193,6 +210,22 @@ def request_security(
         out = pd.Series(index=df_ltf.index, dtype="float64")
         return out
 
+    # 6-1. fast path: LTF 인덱스가 이미 정렬되어 있으면 searchsorted 로 바로 매핑
+    #      (merge_asof direction="backward" 와 동일: ts 이하인 마지막 HTF 값)
+    if df_shifted.index.is_monotonic_increasing:
+        htf_ns = htf_clean.index.asi8
+        ltf_ns = df_shifted.index.asi8
+        idx = np.searchsorted(htf_ns, ltf_ns, side="right") - 1
+        htf_vals = htf_clean.to_numpy()
+        vals = np.where(idx >= 0, htf_vals[np.clip(idx, 0, None)], np.nan)
+        return pd.Series(vals, index=df_ltf.index)
+
+    # 6-2. fallback: 정렬되지 않은 입력은 merge_asof 로 처리
+    # LTF 쪽 준비
+    ltf_frame = pd.DataFrame(index=df_shifted.index).sort_index()
+    ltf_reset = ltf_frame.reset_index()
+    ltf_time_col = ltf_reset.columns[0]
+
     htf_reset = htf_clean.to_frame("val").reset_index()
     htf_time_col = htf_reset.columns[0]
 
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The helpers are imported as the top-level "modules" package, like runner_service does
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
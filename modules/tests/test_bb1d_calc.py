@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from modules.bb1d_calc import bb_series  # noqa: E402
+from modules.request_security import read_ohlcv_i32_f32_le  # noqa: E402
+
+DEMO_OHLCV = Path(__file__).resolve().parents[2] / "workdir" / "data" / "demo.ohlcv"
+
+# float32 BB must stay this close (relative) to the float64 computation
+REL_TOLERANCE = 1e-4
+
+
+@pytest.mark.parametrize("period, mult, biased", [(20, 2.0, True), (20, 2.0, False), (50, 3.0, True)])
+def test_bb_lower_float32_matches_float64(period, mult, biased):
+    # The daily closes are what get_bb1d_lower passes to bb_series after resampling
+    close = read_ohlcv_i32_f32_le(str(DEMO_OHLCV))["close"]
+
+    _, _, lower = bb_series(close, period, mult, biased=biased)
+    assert lower.dtype == np.float32
+
+    close64 = close.astype(np.float64).rolling(window=period)
+    expected = close64.mean() - mult * close64.std(ddof=0 if biased else 1)
+
+    valid = expected.notna()
+    assert lower.isna().equals(~valid)
+    rel = np.abs(lower[valid].astype(np.float64) - expected[valid]) / np.abs(expected[valid])
+    assert rel.max() <= REL_TOLERANCE
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 
-from modules.request_security import request_security, read_ohlcv_i32_f32_le
+from modules.request_security import request_security, read_ltf_frame
 
 
 # ============================================================
@@ -14,7 +14,7 @@ def get_weekly_high_low(
     ago: int,
     session_offset_hours: int = 9,
     lookahead_on: bool = False
-) -> tuple[list, list]:
+) -> tuple[np.ndarray, np.ndarray]:
     """
     5분봉 OHLCV DataFrame 기준으로
     마지막 5분봉 시점에 보이는 '2주 전 주봉' 의 high / low 값을 반환한다.
@@ -22,9 +22,8 @@ def get_weekly_high_low(
     개념적으로:
         request.security(timeframe="1W", high[2]) 와 동일한 효과를 노린다.
     """
-    df_5m: pd.DataFrame = read_ohlcv_i32_f32_le(data_path)
-    # 정렬 및 중복 제거
-    df_5m = df_5m[~df_5m.index.duplicated(keep="last")].sort_index()
+    # 정렬 및 중복 제거된 5분봉 (같은 파일이면 캐시 공유)
+    df_5m: pd.DataFrame = read_ltf_frame(data_path)
 
     # 주의:
     #   lookahead_off 가 이미 1바 뒤로 밀어주므로,
@@ -53,8 +52,8 @@ def get_weekly_high_low(
         session_offset_hours=session_offset_hours,
     )
 
-    # 5) NaN -> 0.0 변환 후 list[float] 로 변환
-    list_weekly_high = np.nan_to_num(weekly_high.values, nan=0.0).astype(float).tolist()
-    list_weekly_low = np.nan_to_num(weekly_low.values, nan=0.0).astype(float).tolist()
+    # 5) NaN -> 0.0 변환 후 ndarray 그대로 반환 (bar_index 로 인덱싱 가능, list 변환 비용 없음)
+    weekly_high_arr = np.nan_to_num(weekly_high.to_numpy(dtype=np.float64), nan=0.0)
+    weekly_low_arr = np.nan_to_num(weekly_low.to_numpy(dtype=np.float64), nan=0.0)
 
-    return list_weekly_high, list_weekly_low
+    return weekly_high_arr, weekly_low_arr
@@ -17,6 +17,9 @@ WRITE_DICT = 1
 WRITE_OHLCV = 2
 STOP = 3
 FLUSH = 4
+WRITE_BATCH = 5
+WRITE_LINE = 6
+WRITE_OHLCV_EXTRA = 7
 
 
 class DialectLF(csv.excel):
@@ -30,16 +33,19 @@ csv.register_dialect("lf", DialectLF)
 class CSVWriter:
     """
     Fast CSV writer for OHLCV data with extra fields.
-    Uses a background thread and buffering for better performance.
+    Uses a background thread and buffering for better performance. Records are collected
+    on the caller side and handed to the worker thread in batches, so the per-record cost
+    is a list append instead of a locked queue operation.
     """
     __slots__ = ('path', '_file', '_buffer_size', '_float_fmt',
                  '_timestamp_as_iso', '_headers', '_queue',
                  '_worker', '_error', '_is_open', '_lock',
-                 '_idle_time', '_dialect')
+                 '_idle_time', '_dialect', '_pending', '_batch_size')
 
     def __init__(self, path: Path, *,
                  buffer_size: int = 32768,
                  queue_size: int = 4096,
+                 batch_size: int = 256,
                  float_fmt: str = '.8g',
                  timestamp_as_iso: bool = True,
                  idle_time: float = 0.016,
@@ -49,6 +55,7 @@ class CSVWriter:
         :param path: Output file path
         :param buffer_size: Internal buffer size in bytes
         :param queue_size: Size of the command queue
+        :param batch_size: Number of records collected before they are queued to the worker at once
         :param float_fmt: Format string for float values
         :param timestamp_as_iso: If True, timestamps will be written as ISO datetime strings
         :param idle_time: Idle time in seconds before flushing the buffer
@@ -67,6 +74,9 @@ class CSVWriter:
 
         # Thread-safe queue for commands
         self._queue = queue.Queue(maxsize=queue_size)
+        # Records not yet handed to the worker thread
+        self._pending: list[tuple[int, Any]] = []
+        self._batch_size = max(1, batch_size)
         self._worker = None
         self._error = None
         self._is_open = False
@@ -84,6 +94,11 @@ class CSVWriter:
         """Check if the writer is open"""
         return self._is_open
 
+    @property
+    def float_fmt(self) -> str:
+        """Format string used for float values"""
+        return self._float_fmt
+
     def _worker_thread(self):
         """Background worker thread for handling I/O operations"""
         buffer = io.StringIO()
@@ -95,6 +110,77 @@ class CSVWriter:
 
         assert self._file is not None
 
+        def write_record(cmd: int, data: Any) -> None:
+            # Pre-formatted row, written as-is
+            if cmd == WRITE_LINE:
+                if not self._headers:
+                    raise ValueError(f"No headers provided!")
+                buffer.write(data)
+                return
+
+            # Write header if needed
+            if not self._headers:
+                if cmd == WRITE_DICT:
+                    headers = list(data.keys())
+                    writer.writerow(headers)
+                elif cmd == WRITE_OHLCV:
+                    headers = ['time', 'open', 'high', 'low', 'close', 'volume']
+                    if data.extra_fields:
+                        headers.extend(data.extra_fields.keys())
+                    writer.writerow(headers)
+                elif cmd == WRITE_OHLCV_EXTRA:
+                    headers = ['time', 'open', 'high', 'low', 'close', 'volume']
+                    headers.extend(key for key, _ in data[1])
+                    writer.writerow(headers)
+                else:
+                    raise ValueError(f"No headers provided!")
+                self._headers = headers
+
+            # Format Timestamp
+            row.clear()
+
+            # Raw dictionary data
+            if cmd == WRITE_DICT:
+                data = data.values()
+
+            # OHLCV data
+            if cmd == WRITE_OHLCV or cmd == WRITE_OHLCV_EXTRA:
+                if cmd == WRITE_OHLCV:
+                    extra_values = data.extra_fields.values() if data.extra_fields else ()
+                else:
+                    data, extra_items = data
+                    extra_values = (value for _, value in extra_items)
+
+                if self._timestamp_as_iso:
+                    row.append(datetime.fromtimestamp(data.timestamp, UTC).isoformat())
+                else:
+                    row.append(str(data.timestamp))
+
+                # Format OHLCV values
+                row.extend(fmt.format(x) for x in (data.open, data.high, data.low, data.close, data.volume))
+                # Format extra fields
+                for value in extra_values:
+                    if isinstance(value, float):
+                        row.append(fmt.format(value))
+                    else:
+                        row.append(str(value))
+
+            # Tuple or dict data
+            else:
+                for value in data:
+                    if isinstance(value, float):
+                        row.append(fmt.format(value))
+                    elif isinstance(value, datetime):
+                        if self._timestamp_as_iso:
+                            row.append(value.isoformat())
+                        else:
+                            row.append(str(value))
+                    else:
+                        row.append(str(value))
+
+            # Write row to buffer
+            writer.writerow(row)
+
         try:
             while True:
                 try:
@@ -121,59 +207,11 @@ class CSVWriter:
                     self._queue.task_done()
                     continue
 
-                # Write header if needed
-                if not self._headers:
-                    if cmd == WRITE_DICT:
-                        headers = list(data.keys())
-                        writer.writerow(headers)
-                    elif cmd == WRITE_OHLCV:
-                        headers = ['time', 'open', 'high', 'low', 'close', 'volume']
-                        if data.extra_fields:
-                            headers.extend(data.extra_fields.keys())
-                        writer.writerow(headers)
-                    else:
-                        raise ValueError(f"No headers provided!")
-                    self._headers = headers
-
-                # Format Timestamp
-                row.clear()
-
-                # Raw dictionary data
-                if cmd == WRITE_DICT:
-                    data = data.values()
-
-                # OHLCV data
-                if cmd == WRITE_OHLCV:
-                    if self._timestamp_as_iso:
-                        row.append(datetime.fromtimestamp(data.timestamp, UTC).isoformat())
-                    else:
-                        row.append(str(data.timestamp))
-
-                    # Format OHLCV values
-                    row.extend(fmt.format(x) for x in (data.open, data.high, data.low, data.close, data.volume))
-                    # Format extra fields
-                    if data.extra_fields:
-                        for value in data.extra_fields.values():
-                            if isinstance(value, float):
-                                row.append(fmt.format(value))
-                            else:
-                                row.append(str(value))
-
-                # Tuple or dict data
+                if cmd == WRITE_BATCH:
+                    for record_cmd, record_data in data:
+                        write_record(record_cmd, record_data)
                 else:
-                    for value in data:
-                        if isinstance(value, float):
-                            row.append(fmt.format(value))
-                        elif isinstance(value, datetime):
-                            if self._timestamp_as_iso:
-                                row.append(value.isoformat())
-                            else:
-                                row.append(str(value))
-                        else:
-                            row.append(str(value))
-
-                # Write row to buffer
-                writer.writerow(row)
+                    write_record(cmd, data)
                 self._queue.task_done()
 
                 # Write if buffer is half full
@@ -225,16 +263,7 @@ class CSVWriter:
         :return: True if write command was queued, False on timeout
         :raises RuntimeError: If writer thread has died with an error
         """
-        if not self._is_open:
-            raise RuntimeError("Writer not opened!")
-        if self._error:
-            raise RuntimeError(f"Writer thread error: {self._error}!")
-
-        try:
-            self._queue.put((WRITE_DICT, data), timeout=timeout)
-            return True
-        except queue.Full:
-            return False
+        return self._enqueue(WRITE_DICT, data, timeout)
 
     def write(self, *data: int | float | str, timeout: Optional[float] = None) -> bool:
         """
@@ -245,16 +274,19 @@ class CSVWriter:
         :return: True if write command was queued, False on timeout
         :raises RuntimeError: If writer thread has died with an error
         """
-        if not self._is_open:
-            raise RuntimeError("Writer not opened!")
-        if self._error:
-            raise RuntimeError(f"Writer thread error: {self._error}!")
+        return self._enqueue(WRITE_TUPLE, data, timeout)
 
-        try:
-            self._queue.put((WRITE_TUPLE, data), timeout=timeout)
-            return True
-        except queue.Full:
-            return False
+    def write_line(self, line: str, timeout: Optional[float] = None) -> bool:
+        """
+        Write a pre-formatted CSV row. The caller is responsible for formatting and quoting
+        the fields and for the line terminator; headers must have been given to the writer.
+
+        :param line: The complete row, including the line terminator
+        :param timeout: Optional timeout in seconds
+        :return: True if write command was queued, False on timeout
+        :raises RuntimeError: If writer thread has died with an error
+        """
+        return self._enqueue(WRITE_LINE, line, timeout)
 
     def write_ohlcv(self, candle: OHLCV, timeout: Optional[float] = None) -> bool:
         """
@@ -265,16 +297,60 @@ class CSVWriter:
         :return: True if write command was queued, False on timeout
         :raises RuntimeError: If writer thread has died with an error
         """
+        return self._enqueue(WRITE_OHLCV, candle, timeout)
+
+    def write_ohlcv_extra(self, candle: OHLCV, extra_fields: dict[str, Any],
+                          timeout: Optional[float] = None) -> bool:
+        """
+        Write a single OHLCV record with extra fields given separately, so no new OHLCV
+        has to be created. The extra fields are copied, the caller can reuse the dict.
+
+        :param candle: The OHLCV record to write
+        :param extra_fields: Extra fields written after the candle's own extra fields
+        :param timeout: Optional timeout in seconds
+        :return: True if write command was queued, False on timeout
+        :raises RuntimeError: If writer thread has died with an error
+        """
+        if candle.extra_fields:
+            merged = dict(candle.extra_fields)
+            merged.update(extra_fields)
+            return self._enqueue(WRITE_OHLCV, candle._replace(extra_fields=merged), timeout)
+        return self._enqueue(WRITE_OHLCV_EXTRA, (candle, tuple(extra_fields.items())), timeout)
+
+    def _enqueue(self, cmd: int, data: Any, timeout: Optional[float]) -> bool:
+        """
+        Collect a record and hand the collected batch to the worker once it is full.
+
+        :return: True if the record was accepted, False if the batch could not be queued in time,
+                 then the record is dropped, so it is not written twice if the caller retries
+        :raises RuntimeError: If writer is not opened or the writer thread has died with an error
+        """
         if not self._is_open:
             raise RuntimeError("Writer not opened!")
         if self._error:
             raise RuntimeError(f"Writer thread error: {self._error}!")
 
-        try:
-            self._queue.put((WRITE_OHLCV, candle), timeout=timeout)
+        pending = self._pending
+        pending.append((cmd, data))
+        if len(pending) >= self._batch_size and not self._put_pending(timeout):
+            pending.pop()
+            return False
+        return True
+
+    def _put_pending(self, timeout: Optional[float] = None) -> bool:
+        """
+        Queue the collected records to the worker thread as a single batch.
+
+        :return: True if there was nothing to queue or the batch was queued, False on timeout
+        """
+        if not self._pending:
             return True
+        try:
+            self._queue.put((WRITE_BATCH, self._pending), timeout=timeout)
         except queue.Full:
-            return False
+            return False  # Keep the accepted records, they go out with the next batch
+        self._pending = []
+        return True
 
     def flush(self, timeout: Optional[float] = None):
         """
@@ -286,6 +362,7 @@ class CSVWriter:
             return
 
         try:
+            self._put_pending(timeout)
             self._queue.put((FLUSH, None), timeout=timeout)
             # Wait for the flush to complete
             self._queue.join()
@@ -302,8 +379,9 @@ class CSVWriter:
             if not self._is_open:
                 return
 
-            # Signal the worker to stop
+            # Hand over the remaining records, then signal the worker to stop
             try:
+                self._put_pending(timeout)
                 self._queue.put((STOP, None), timeout=timeout)
             except queue.Full:
                 pass  # We'll stop anyway
@@ -318,6 +396,7 @@ class CSVWriter:
                 self._file.close()
                 self._file = None
 
+            self._pending = []
             self._is_open = False
 
             # Re-raise any worker thread error
@@ -5,7 +5,7 @@ from copy import copy
 from .pine_export import Exported
 from .series import SeriesImpl
 
-__all__ = ['isolate_function', 'reset']
+__all__ = ['isolate_function', 'reset', 'attach', 'detach']
 
 # Store all function instances
 _function_cache: dict[str | tuple, FunctionType] = {}
@@ -18,6 +18,25 @@ def reset():
     _function_cache.clear()
 
 
+def attach(store: dict[str | tuple, FunctionType]):
+    """
+    Use the given dict as the function instance store, it is cleared in place for a fresh run
+
+    :param store: The store owned by the caller (e.g. a ScriptRunner), kept between runs
+    """
+    global _function_cache
+    store.clear()
+    _function_cache = store
+
+
+def detach():
+    """
+    Stop using the attached store, it is left to its owner
+    """
+    global _function_cache
+    _function_cache = {}
+
+
 def isolate_function(
         func: FunctionType | Callable, call_id: str | None, parent_scope: str,
         closure_argument_count: int = -1, call_counter: int = 0
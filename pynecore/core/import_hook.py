@@ -5,6 +5,10 @@ import importlib.util
 import importlib.machinery
 import re
 from pathlib import Path
+from types import CodeType
+
+# Transformed code of Pyne scripts, keyed by path and source, so re-imports skip the AST transformation
+_code_cache: dict[tuple[str, bytes | str, int], CodeType] = {}
 
 
 class PyneLoader(importlib.machinery.SourceFileLoader):
@@ -36,6 +40,11 @@ class PyneLoader(importlib.machinery.SourceFileLoader):
             # No @pyne decorator, let Python handle it normally
             return compile(data, path, 'exec', optimize=_optimize)
 
+        cache_key = (str(path), data, _optimize)
+        code = _code_cache.get(cache_key)
+        if code is not None:
+            return code
+
         import ast
 
         # Parse AST only if @pyne is present
@@ -74,7 +83,9 @@ class PyneLoader(importlib.machinery.SourceFileLoader):
 
             transformed = ImportLifterTransformer().visit(transformed)
             transformed = ImportNormalizerTransformer().visit(transformed)
-            transformed = RequestSecurityTransformer().visit(transformed)
+            # Scripts without request.security have no call to wrap
+            if 'security' in data_str:
+                transformed = RequestSecurityTransformer().visit(transformed)
             transformed = PersistentSeriesTransformer().visit(transformed)
             transformed = LibrarySeriesTransformer().visit(transformed)
             transformed = ModulePropertyTransformer().visit(transformed)
@@ -112,7 +123,9 @@ class PyneLoader(importlib.machinery.SourceFileLoader):
             tree = transformed
 
         # Let Python handle bytecode caching
-        return compile(tree, path, 'exec', optimize=_optimize)
+        code = compile(tree, path, 'exec', optimize=_optimize)
+        _code_cache[cache_key] = code
+        return code
 
 
 class PyneImportHook:
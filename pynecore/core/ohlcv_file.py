@@ -37,6 +37,8 @@ from ..core.syminfo import SymInfoInterval
 
 RECORD_SIZE = 24  # 6 * 4
 STRUCT_FORMAT = 'Ifffff'  # I: uint32, f: float32
+# Records unpacked at once by OHLCVReader.read_from()
+_READ_CHUNK_RECORDS = 16384
 
 __all__ = ['OHLCVWriter', 'OHLCVReader']
 
@@ -1533,16 +1535,22 @@ class OHLCVReader:
         # Calculate start and end positions
         start_pos, end_pos = self.get_positions(start_timestamp, end_timestamp)
 
-        # Yield the calculated range
-        for pos in range(start_pos, end_pos):
-            ohlcv = self.read(pos)
-            if ohlcv is not None:
+        # Yield the calculated range, unpacking a whole chunk of records at once instead of
+        # slicing and unpacking them one by one. The chunks are copies, so the mapping can
+        # still be closed while this generator is suspended.
+        for chunk_start in range(start_pos, end_pos, _READ_CHUNK_RECORDS):
+            if self._mmap is None:
+                return
+            chunk_end = min(chunk_start + _READ_CHUNK_RECORDS, end_pos)
+            data = self._mmap[chunk_start * RECORD_SIZE:chunk_end * RECORD_SIZE]
+            for values in struct.iter_unpack(STRUCT_FORMAT, data):
                 # volume < 0: Pyne가 gap 보정용으로 만든 봉이므로 항상 제외.
                 # volume == 0: OKX/Binance처럼 TradingView가 hidden 처리하는 거래소에서만 제외.
                 # BITGET/Hyperliquid는 0-volume 봉도 TV 차트/계산에 포함되므로 skip_zero_volume=False로 읽어야 한다.
-                if skip_gaps and (ohlcv.volume < 0 or (skip_zero_volume and ohlcv.volume == 0)):
+                volume = values[5]
+                if skip_gaps and (volume < 0 or (skip_zero_volume and volume == 0)):
                     continue
-                yield ohlcv
+                yield OHLCV(*values, extra_fields={})
 
     def close(self):
         """
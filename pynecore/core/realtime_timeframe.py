@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class TimeframeSpec(NamedTuple):
+    """Parsed ccxt-style realtime timeframe (e.g. "1m", "15m", "4h", "1d")."""
+    unit: str
+    value: int
+    minutes: int
+    ms: int
+    # Timeframe as used by pyne data files / providers ("15m" -> "15", "4h" -> "240", "1d" -> "1d").
+    pyne_period: str
+
+
+@lru_cache(maxsize=None)
+def parse_tf(tf: str) -> TimeframeSpec:
+    """Parse a realtime timeframe string once; repeated calls hit the cache."""
+    unit = tf[-1]
+    value = int(tf[:-1])
+
+    if unit == "m":
+        minutes = value
+        pyne_period = str(value)
+    elif unit == "h":
+        minutes = value * 60
+        pyne_period = str(minutes)
+    else:  # "d"
+        minutes = value * 24 * 60
+        pyne_period = tf
+
+    return TimeframeSpec(unit, value, minutes, minutes * 60 * 1000, pyne_period)
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta, UTC
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, Sequence
 from functools import lru_cache
 
 from .datetime import parse_timezone
@@ -123,3 +123,56 @@ class Resampler:
         
         # Convert back to milliseconds
         return bar_start_sec * 1000
+
+    def get_bar_times(self, times_ms: Sequence[int]) -> list[int]:
+        """
+        Calculate the bar opening times for many timestamps at once.
+
+        The bar opening time never decreases as time goes on, so for sorted timestamps the runs
+        of the same bar are found by bisection, and get_bar_time() is only called a few times
+        per bar instead of once per timestamp.
+
+        :param times_ms: Timestamps in milliseconds (UNIX timestamp), sorted in ascending order
+        :return: Bar opening times in milliseconds, one for each timestamp
+        """
+        modifier, _ = tf_module._process_tf(self.timeframe)
+        if modifier in ('S', ''):
+            # Fixed length bars, no calendar needed
+            tf_seconds = tf_module.in_seconds(self.timeframe)
+            return [(t // 1000 // tf_seconds) * tf_seconds * 1000 for t in times_ms]
+
+        get_bar_time = self.get_bar_time
+        result: list[int] = []
+        size = len(times_ms)
+        start = 0
+        run_length = 1
+        bar_time = get_bar_time(times_ms[0]) if size else 0
+        next_bar_time = bar_time
+        while start < size:
+            # Gallop forward from the length of the previous run, then bisect the first timestamp of the next bar.
+            # The search always ends on a probed index (or the end), its bar time is the next run's bar time.
+            lo = start
+            step = run_length
+            hi = start + step
+            while hi < size:
+                next_bar_time = get_bar_time(times_ms[hi])
+                if next_bar_time != bar_time:
+                    break
+                lo = hi
+                step *= 2
+                hi = start + step
+            else:
+                hi = size
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                mid_bar_time = get_bar_time(times_ms[mid])
+                if mid_bar_time == bar_time:
+                    lo = mid
+                else:
+                    hi = mid
+                    next_bar_time = mid_bar_time
+            run_length = hi - start
+            result.extend([bar_time] * run_length)
+            start = hi
+            bar_time = next_bar_time
+        return result
@@ -194,9 +194,12 @@ class Script:
             else:
                 lines.append("#value =")
 
-        # Write to file
-        with open(path, 'w', encoding='utf-8') as f:
+        # Write to file. Through a temporary file and a rename, so parallel runs of the same script
+        # (e.g. run_many() parameter sweeps) never load a half written file
+        tmp_path = Path(path).with_name(f"{Path(path).name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
 
     def load(self, path: str | Path) -> None:
         """
@@ -1,7 +1,10 @@
 import os
+import re
+from functools import lru_cache
 from typing import Iterable, Iterator, Callable, TYPE_CHECKING, Any
 from types import ModuleType
 import sys
+from array import array
 from pathlib import Path
 from datetime import datetime, UTC
 
@@ -25,32 +28,111 @@ __all__ = [
 ]
 
 
+# Which of the numeric trade row columns (after the 5 leading fields) are percents
+_TRADE_PERCENT_COLS = (False, False, False, True, False, True, False, True, False, True)
+# Trade row types, indexed by `trade.size > 0`
+_ENTRY_TYPES = ("Entry short", "Entry long")
+_EXIT_TYPES = ("Exit short", "Exit long")
+
+
+def _csv_field(value: Any) -> str:
+    """
+    Quote a free-text field (e.g. an order comment) the way csv.writer's minimal quoting does
+    """
+    s = str(value)
+    if ',' in s or '"' in s or '\n' in s or '\r' in s:
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+
+def _trade_row_formatter(float_fmt: str) -> Callable[..., str]:
+    """
+    Create the formatter of one trades CSV row, numbers are formatted the same way
+    CSVWriter formats them, percents with 2 decimals
+
+    :param float_fmt: Float format of the trades writer
+    :return: A function, which formats the row fields to one CSV line
+    """
+    num_fmt = '{:' + float_fmt + '}'
+    pct_fmt = '{:.2f}'
+    col_fmts = tuple(pct_fmt if is_pct else num_fmt for is_pct in _TRADE_PERCENT_COLS)
+    # Fast path: one format call, if all numbers are floats
+    row_fmt = ('{},{},{},{},{},' + ','.join(col_fmts) + '\n').format
+
+    def format_row(*values: Any) -> str:
+        numbers = values[5:]
+        if all(type(value) is float for value in numbers):
+            return row_fmt(*values)
+        # NA and integer values are written like CSVWriter.write() writes them
+        fields = [str(value) for value in values[:5]]
+        for fmt, is_pct, value in zip(col_fmts, _TRADE_PERCENT_COLS, numbers):
+            if isinstance(value, float) or (is_pct and isinstance(value, int)):
+                fields.append(fmt.format(value))
+            else:
+                fields.append(str(value))
+        return ','.join(fields) + '\n'
+
+    return format_row
+
+
+# Docstring containing @pyne at the beginning of a line
+_PYNE_HEADER_RE = re.compile(r'^(""".*?@pyne.*?"""|\'\'\'.*?@pyne.*?\'\'\')', re.DOTALL | re.MULTILINE)
+
+
+@lru_cache(maxsize=128)
+def _has_pyne_header(path: str, mtime_ns: int) -> bool:
+    """
+    Check for the @pyne magic doc comment, cached by path and modification time
+
+    :param path: Path of the script file
+    :param mtime_ns: Modification time of the file, only used as part of the cache key
+    :return: True if the file starts with a docstring containing @pyne
+    """
+    with open(path, 'rb') as f:
+        # Read first 1KB, should be enough for docstring check
+        content = f.read(1024).decode('utf-8', errors='ignore')
+    return _PYNE_HEADER_RE.search(content) is not None
+
+
+def _require_pyne_header(script_path: Path) -> None:
+    """
+    Make sure the script has the @pyne magic doc comment
+
+    :param script_path: The path to the script
+    :raises ImportError: If the script could not be read or has no @pyne magic doc comment
+    """
+    try:
+        has_header = _has_pyne_header(str(script_path), os.stat(script_path).st_mtime_ns)
+    except (OSError, IOError) as e:
+        raise ImportError(f"Could not read script file '{script_path}': {e}")
+    if not has_header:
+        raise ImportError(
+            f"Script '{script_path}' must have a magic doc comment containing "
+            f"'@pyne' at the beginning of the file!"
+        )
+
+
+@lru_cache(maxsize=1)
+def _load_telegram_env() -> tuple[str | None, str | None]:
+    """
+    Load the .env file once per process and return the telegram bot token and chat id
+    """
+    load_dotenv()
+    return os.getenv('BOT_TOKEN'), os.getenv('CHAT_ID')
+
+
 def import_script(script_path: Path) -> ModuleType:
     """
     Import the script
     """
     from importlib import import_module
-    import re
     # Import hook only before importing the script, to make import hook being used only for Pyne scripts
     # (this makes 1st run faster, than if it would be a top-level import)
     from . import import_hook  # noqa
 
     # Check for @pyne magic doc comment before importing (prevents import errors)
     # Without this user may get strange errors which are very hard to debug
-    try:
-        with open(script_path, 'r') as f:
-            # Read only the first few lines to check for docstring
-            content = f.read(1024)  # Read first 1KB, should be enough for docstring check
-
-        # Check if file starts with a docstring containing @pyne
-        if not re.search(r'^(""".*?@pyne.*?"""|\'\'\'.*?@pyne.*?\'\'\')',
-                         content, re.DOTALL | re.MULTILINE):
-            raise ImportError(
-                f"Script '{script_path}' must have a magic doc comment containing "
-                f"'@pyne' at the beginning of the file!"
-            )
-    except (OSError, IOError) as e:
-        raise ImportError(f"Could not read script file '{script_path}': {e}")
+    _require_pyne_header(script_path)
 
     # Add script's directory to Python path temporarily
     sys.path.insert(0, str(script_path.parent))
@@ -70,6 +152,22 @@ def import_script(script_path: Path) -> ModuleType:
     return module
 
 
+def precompile_script(script_path: Path) -> None:
+    """
+    Run the Pyne AST transformation of a script without executing it, so the first
+    ScriptRunner creation only has to execute the already compiled module
+
+    :param script_path: The path to the script
+    :raises ImportError: If the script does not have the @pyne magic doc comment
+    """
+    from .import_hook import PyneLoader
+
+    _require_pyne_header(script_path)
+
+    # Compiles (or loads from .pyc) and fills the in-process code cache of the loader
+    PyneLoader(script_path.stem, str(script_path)).get_code(script_path.stem)
+
+
 def _round_price(price: float):
     """
     Round price to 6 significant digits to clean float32 storage artifacts
@@ -108,36 +206,47 @@ def _set_lib_properties(ohlcv: OHLCV, bar_index: int, tz: 'ZoneInfo', lib: Modul
     # feed OHLC values directly. Tick rounding should stay in explicit helpers
     # such as math.round_to_mintick and in strategy order simulation, not in the
     # global OHLC sources.
-    lib.open = ohlcv.open
-    lib.high = ohlcv.high
-    lib.low = ohlcv.low
-    lib.close = ohlcv.close
+    # Composites are computed from locals: every lib.<field> read goes through the
+    # thread-local bar state property, so reading them back would cost a descriptor call each
+    o, h, l, c = ohlcv.open, ohlcv.high, ohlcv.low, ohlcv.close
+    lib.open = o
+    lib.high = h
+    lib.low = l
+    lib.close = c
 
     lib.volume = ohlcv.volume
 
-    lib.hl2 = (lib.high + lib.low) / 2.0
-    lib.hlc3 = (lib.high + lib.low + lib.close) / 3.0
-    lib.ohlc4 = (lib.open + lib.high + lib.low + lib.close) / 4.0
-    lib.hlcc4 = (lib.high + lib.low + 2 * lib.close) / 4.0
+    lib.hl2 = (h + l) / 2.0
+    lib.hlc3 = (h + l + c) / 3.0
+    lib.ohlc4 = (o + h + l + c) / 4.0
+    lib.hlcc4 = (h + l + 2 * c) / 4.0
+
+    # PineScript representation of time. It is the UTC epoch, so it does not depend on tz;
+    # lib._datetime (the tz-converted datetime) is only built if the bar reads it.
+    lib._set_bar_time(int(ohlcv.timestamp * 1000), tz)
+
+
+# SymInfo fields copied to lib.syminfo (a plain module, so setting an attribute cannot fail)
+_SYMINFO_SLOTS: tuple[str, ...] = tuple(SymInfo.__slots__)  # type: ignore
 
-    dt = lib._datetime = datetime.fromtimestamp(ohlcv.timestamp, UTC).astimezone(tz)
-    lib._time = lib.last_bar_time = int(dt.timestamp() * 1000)  # PineScript representation of time
+# The SymInfo that was applied to lib.syminfo last, to only re-apply it if another runner changed it
+_lib_syminfo_owner: SymInfo | None = None
 
 
 def _set_lib_syminfo_properties(syminfo: SymInfo, lib: ModuleType):
     """
     Set syminfo library properties from this object
     """
+    global _lib_syminfo_owner
     if TYPE_CHECKING:  # This is needed for the type checker to work
         from .. import lib
+    _lib_syminfo_owner = syminfo
 
-    for slot_name in syminfo.__slots__:  # type: ignore
+    lib_syminfo = lib.syminfo
+    for slot_name in _SYMINFO_SLOTS:
         value = getattr(syminfo, slot_name)
         if value is not None:
-            try:
-                setattr(lib.syminfo, slot_name, value)
-            except AttributeError:
-                pass
+            setattr(lib_syminfo, slot_name, value)
 
     lib.syminfo.root = syminfo.ticker
     lib.syminfo.ticker = syminfo.prefix + ':' + syminfo.ticker
@@ -147,34 +256,38 @@ def _set_lib_syminfo_properties(syminfo: SymInfo, lib: ModuleType):
     lib.syminfo._session_ends = syminfo.session_ends
 
     if syminfo.type == 'crypto':
-        decimals = 6 if syminfo.basecurrency == 'BTC' else 4  # TODO: is it correct?
-        lib.syminfo._size_round_factor = 10 ** decimals
+        # 6 decimals for BTC, 4 otherwise  # TODO: is it correct?
+        lib.syminfo._size_round_factor = 1_000_000 if syminfo.basecurrency == 'BTC' else 10_000
     else:
         lib.syminfo._size_round_factor = 1
 
 
+# Source placeholders (name -> Source) assigned by _reset_lib_vars, created on first use.
+# Source objects only hold their name, so the same instances can be reused by every reset.
+_reset_sources: tuple[tuple[str, Any], ...] | None = None
+_EPOCH_DATETIME = datetime.fromtimestamp(0, UTC)
+
+
 def _reset_lib_vars(lib: ModuleType):
     """
     Reset lib variables to be able to run other scripts
     :param lib:
     :return:
     """
+    global _reset_sources
     if TYPE_CHECKING:  # This is needed for the type checker to work
         from .. import lib
-    from ..types.source import Source
-
-    lib.open = Source("open")
-    lib.high = Source("high")
-    lib.low = Source("low")
-    lib.close = Source("close")
-    lib.volume = Source("volume")
-    lib.hl2 = Source("hl2")
-    lib.hlc3 = Source("hlc3")
-    lib.ohlc4 = Source("ohlc4")
-    lib.hlcc4 = Source("hlcc4")
+
+    if _reset_sources is None:
+        from ..types.source import Source
+        _reset_sources = tuple((name, Source(name)) for name in (
+            "open", "high", "low", "close", "volume", "hl2", "hlc3", "ohlc4", "hlcc4"))
+
+    for name, source in _reset_sources:
+        setattr(lib, name, source)
 
     lib._time = 0
-    lib._datetime = datetime.fromtimestamp(0, UTC)
+    lib._datetime = _EPOCH_DATETIME
 
     lib._lib_semaphore = False
 
@@ -182,6 +295,61 @@ def _reset_lib_vars(lib: ModuleType):
     lib.barstate.islast = False
 
 
+def _prefetch_iter(iterable: Iterable[OHLCV], chunk_size: int) -> Iterator[OHLCV]:
+    """
+    Read the iterable in a background thread, in chunks, while the script runs on the previous ones
+
+    :param iterable: The (typically I/O bound) source of the candles
+    :param chunk_size: Number of candles handed over at once
+    :return: Iterator of the same candles in the same order
+    """
+    import queue
+    import threading
+
+    chunks: queue.Queue = queue.Queue(maxsize=4)
+    stop = threading.Event()
+    error: list[BaseException] = []
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def producer():
+        chunk = []
+        try:
+            for candle in iterable:
+                chunk.append(candle)
+                if len(chunk) >= chunk_size:
+                    if not put(chunk):
+                        return
+                    chunk = []
+            if chunk:
+                put(chunk)
+        except BaseException as e:  # noqa
+            error.append(e)
+        finally:
+            put(None)
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            yield from chunk
+        if error:
+            raise error[0]
+    finally:
+        # Stop the producer if the consumer finished early
+        stop.set()
+
+
 class ScriptRunner:
     """
     Script runner
@@ -189,14 +357,14 @@ class ScriptRunner:
 
     __slots__ = ('script_module', 'script', 'ohlcv_iter', 'syminfo', 'update_syminfo_every_run',
                  'bar_index', 'tz', 'plot_writer', 'strat_writer', 'trades_writer', 'last_bar_index',
-                 'equity_curve', 'first_price', 'last_price', '_step_iter', '_all_ohlcv')
+                 'equity_curve', 'first_price', 'last_price', '_step_iter', '_all_ohlcv', '_iso_store')
 
     def __init__(self, script_path: Path, ohlcv_iter: Iterable[OHLCV], syminfo: SymInfo, *,
                  plot_path: Path | None = None, strat_path: Path | None = None,
                  trade_path: Path | None = None,
                  update_syminfo_every_run: bool = False, last_bar_index=0,
                  realtime_config: dict = None, custom_inputs: dict[str, Any] = None,
-                 preload_ohlcv: list[OHLCV] | None = None):
+                 preload_ohlcv: list[OHLCV] | None = None, prefetch: int = 0):
         """
         Initialize the script runner
 
@@ -209,6 +377,8 @@ class ScriptRunner:
         :param update_syminfo_every_run: If it is needed to update the syminfo lib in every run,
                                          needed for parallel script executions
         :param last_bar_index: Last bar index, the index of the last bar of the historical data
+        :param prefetch: If > 0, the OHLCV iterator is read in a background thread in chunks of this size,
+                         useful if the iterator reads from a slow source (not needed for lists)
         :raises ImportError: If the script does not have a 'main' function
         :raises ImportError: If the 'main' function is not decorated with @script.[indicator|strategy|library]
         :raises OSError: If the plot file could not be opened
@@ -235,7 +405,7 @@ class ScriptRunner:
         realtime_config = realtime_config or {}
         # _all_ohlcv list is used for request.security calculation
         self._all_ohlcv: list[OHLCV] | None = preload_ohlcv
-        self.ohlcv_iter = ohlcv_iter
+        self.ohlcv_iter = _prefetch_iter(ohlcv_iter, prefetch) if prefetch > 0 else ohlcv_iter
         self.syminfo = syminfo
         self.update_syminfo_every_run = update_syminfo_every_run
         self.last_bar_index = last_bar_index
@@ -254,19 +424,19 @@ class ScriptRunner:
                     self.script.webhook_url = webhook_section.get('url', None)  # noqa
                     self.script.telegram_notification = webhook_section.get('telegram_notification', False) # noqa
                     if self.script.telegram_notification:
-                        load_dotenv()
-                        self.script.telegram_token = os.getenv('BOT_TOKEN') # noqa
-                        self.script.telegram_chat_id = os.getenv('CHAT_ID') # noqa
+                        self.script.telegram_token, self.script.telegram_chat_id = _load_telegram_env() # noqa
         self.script.custom_inputs = custom_inputs   # noqa
         # step 실행용 내부 제너레이터
         self._step_iter: Iterator[Any] | None = None
+        # Isolated function instances of the script, reused between runs
+        self._iso_store: dict = {}
 
         self.bar_index = 0
 
         self.tz = _parse_timezone(syminfo.timezone)
 
         # Initialize tracking variables for statistics
-        self.equity_curve: list[float] = []
+        self.equity_curve: array[float] = array('d')
         self.first_price: float | None = None
         self.last_price: float | None = None
 
@@ -306,8 +476,8 @@ class ScriptRunner:
 
         # Reset bar_index
         self.bar_index = 0
-        # Reset function isolation
-        function_isolation.reset()
+        # Start function isolation with an empty store
+        function_isolation.attach(self._iso_store)
 
         # Set script data
         lib._script = self.script  # Store script object in lib
@@ -342,19 +512,37 @@ class ScriptRunner:
 
         # Position shortcut
         position = self.script.position
+        # Strategy-only per-bar work is decided once, not on every bar
+        strat_position = position if is_strat else None
+        write_trades = strat_position is not None and self.trades_writer is not None
+
+        # Hoist per-bar lookups into locals, none of these are rebound during iteration
+        main = self.script_module.main
+        plot_data = lib._plot_data
+        plot_data_update = plot_data.update
+        plot_data_clear = plot_data.clear
+        plot_writer = self.plot_writer
+        trades_writer = self.trades_writer
+        format_trade_row = _trade_row_formatter(trades_writer.float_fmt) if trades_writer else None
+        registered_libraries = script._registered_libraries
+        format_time = string.format_time
+        set_lib_properties = _set_lib_properties
+        update_syminfo_every_run = self.update_syminfo_every_run
+        syminfo = self.syminfo
+        tz = self.tz
 
         try:
             for candle in self.ohlcv_iter:
                 # Update syminfo lib properties if needed, other ScriptRunner instances may have changed them
-                if self.update_syminfo_every_run:
-                    _set_lib_syminfo_properties(self.syminfo, lib)
-                    self.tz = _parse_timezone(lib.syminfo.timezone)
+                if update_syminfo_every_run and _lib_syminfo_owner is not syminfo:
+                    _set_lib_syminfo_properties(syminfo, lib)
+                    tz = self.tz = _parse_timezone(lib.syminfo.timezone)
 
                 if self.bar_index == self.last_bar_index:
                     barstate.islast = True
 
                 # Update lib properties
-                _set_lib_properties(candle, self.bar_index, self.tz, lib)
+                set_lib_properties(candle, self.bar_index, tz, lib)
                 sec_ctx = get_security_ctx()
                 if sec_ctx:
                     sec_ctx.update_base_bar(candle, self.bar_index)
@@ -367,83 +555,81 @@ class ScriptRunner:
                 self.last_price = lib.close  # type: ignore
 
                 # Process limit orders
-                if is_strat and position:
-                    position.process_orders()
+                if strat_position is not None:
+                    strat_position.process_orders()
 
                 # Execute registered library main functions before main script
                 lib._lib_semaphore = True
-                for library_title, main_func in script._registered_libraries:
+                for library_title, main_func in registered_libraries:
                     main_func()
                 lib._lib_semaphore = False
 
                 # Run the script
-                res = self.script_module.main()
+                res = main()
 
                 # Update plot data with the results
                 if res is not None:
                     assert isinstance(res, dict), "The 'main' function must return a dictionary!"
-                    lib._plot_data.update(res)
+                    plot_data_update(res)
 
                 # Write plot data to CSV if we have a writer
-                if self.plot_writer and lib._plot_data:
-                    # Create a new dictionary combining extra_fields (if any) with plot data
-                    extra_fields = {} if candle.extra_fields is None else dict(candle.extra_fields)
-                    extra_fields.update(lib._plot_data)
-                    # Create a new OHLCV instance with updated extra_fields
-                    updated_candle = candle._replace(extra_fields=extra_fields)
-                    self.plot_writer.write_ohlcv(updated_candle)
+                if plot_writer and plot_data:
+                    # Plot data is written after the candle's own extra fields (if any)
+                    plot_writer.write_ohlcv_extra(candle, plot_data)
 
                 # Yield plot data to be able to process in a subclass
-                if not is_strat:
-                    yield candle, lib._plot_data
-                elif position:
-                    yield candle, lib._plot_data, position.new_closed_trades
+                if strat_position is not None:
+                    yield candle, plot_data, strat_position.new_closed_trades
+                elif not is_strat:
+                    yield candle, plot_data
 
                 # Save trade data if we have a writer
-                if is_strat and self.trades_writer and position:
-                    for trade in position.new_closed_trades:
+                if write_trades:
+                    for trade in strat_position.new_closed_trades:
                         trade_num += 1  # Start from 1
-                        self.trades_writer.write(
+                        is_long = trade.size > 0
+                        trades_writer.write_line(format_trade_row(
                             trade_num,
                             trade.entry_bar_index,
-                            "Entry long" if trade.size > 0 else "Entry short",
-                            trade.entry_comment if trade.entry_comment else trade.entry_id,
-                            string.format_time(trade.entry_time),  # type: ignore
+                            _ENTRY_TYPES[is_long],
+                            _csv_field(trade.entry_comment or trade.entry_id),
+                            format_time(trade.entry_time),  # type: ignore
                             trade.entry_price,
                             abs(trade.size),
                             trade.profit,
-                            f"{trade.profit_percent:.2f}",
+                            trade.profit_percent,
                             trade.cum_profit,
-                            f"{trade.cum_profit_percent:.2f}",
+                            trade.cum_profit_percent,
                             trade.max_runup,
-                            f"{trade.max_runup_percent:.2f}",
+                            trade.max_runup_percent,
                             trade.max_drawdown,
-                            f"{trade.max_drawdown_percent:.2f}",
-                        )
-                        self.trades_writer.write(
+                            trade.max_drawdown_percent,
+                        ))
+                        trades_writer.write_line(format_trade_row(
                             trade_num,
                             trade.exit_bar_index,
-                            "Exit long" if trade.size > 0 else "Exit short",
-                            trade.exit_comment if trade.exit_comment else trade.exit_id,
-                            string.format_time(trade.exit_time),  # type: ignore
+                            _EXIT_TYPES[is_long],
+                            _csv_field(trade.exit_comment or trade.exit_id),
+                            format_time(trade.exit_time),  # type: ignore
                             trade.exit_price,
                             abs(trade.size),
                             trade.profit,
-                            f"{trade.profit_percent:.2f}",
+                            trade.profit_percent,
                             trade.cum_profit,
-                            f"{trade.cum_profit_percent:.2f}",
+                            trade.cum_profit_percent,
                             trade.max_runup,
-                            f"{trade.max_runup_percent:.2f}",
+                            trade.max_runup_percent,
                             trade.max_drawdown,
-                            f"{trade.max_drawdown_percent:.2f}",
-                        )
+                            trade.max_drawdown_percent,
+                        ))
 
                 # Clear plot data
-                lib._plot_data.clear()
+                plot_data_clear()
 
                 # Track equity curve for strategies
-                if is_strat and position:
-                    current_equity = float(position.equity) if position.equity else self.script.initial_capital
+                if strat_position is not None:
+                    current_equity = float(strat_position.equity) if strat_position.equity \
+                        else self.script.initial_capital
                     self.equity_curve.append(current_equity)
 
                 # Call the progress callback
@@ -467,23 +653,23 @@ class ScriptRunner:
                     for trade in position.open_trades:
                         trade_num += 1  # Continue numbering from closed trades
                         # Export the entry part
-                        self.trades_writer.write(
+                        self.trades_writer.write_line(format_trade_row(
                             trade_num,
                             trade.entry_bar_index,
-                            "Entry long" if trade.size > 0 else "Entry short",
-                            trade.entry_id,
+                            _ENTRY_TYPES[trade.size > 0],
+                            _csv_field(trade.entry_id),
                             string.format_time(trade.entry_time),  # type: ignore
                             trade.entry_price,
                             abs(trade.size),
                             0.0,  # No profit yet for open trades
-                            "0.00",  # No profit percent yet
+                            0.0,  # No profit percent yet
                             0.0,  # No cumulative profit change
-                            "0.00",  # No cumulative profit percent change
+                            0.0,  # No cumulative profit percent change
                             0.0,  # No max runup yet
-                            "0.00",  # No max runup percent yet
+                            0.0,  # No max runup percent yet
                             0.0,  # No max drawdown yet
-                            "0.00",  # No max drawdown percent yet
-                        )
+                            0.0,  # No max drawdown percent yet
+                        ))
 
                         # Export the exit part with "Open" signal (TradingView compatibility)
                         # This simulates automatic closing at the end of backtest
@@ -498,23 +684,23 @@ class ScriptRunner:
                             pnl_percent = (pnl / (trade.entry_price * abs(trade.size))) * 100 \
                                 if trade.entry_price != 0 else 0
 
-                            self.trades_writer.write(
+                            self.trades_writer.write_line(format_trade_row(
                                 trade_num,
                                 self.bar_index - 1,  # Last bar index
-                                "Exit long" if trade.size > 0 else "Exit short",
+                                _EXIT_TYPES[trade.size > 0],
                                 "Open",  # TradingView uses "Open" signal for automatic closes
                                 string.format_time(lib._time),  # type: ignore
                                 exit_price,
                                 abs(trade.size),
                                 pnl,
-                                f"{pnl_percent:.2f}",
+                                pnl_percent,
                                 pnl,  # Same as profit for last trade
-                                f"{pnl_percent:.2f}",
+                                pnl_percent,
                                 max(0.0, pnl),  # Runup
-                                f"{max(0, pnl_percent):.2f}",
+                                max(0, pnl_percent),
                                 max(0.0, -pnl),  # Drawdown
-                                f"{max(0, -pnl_percent):.2f}",
-                            )
+                                max(0, -pnl_percent),
+                            ))
 
                 # Write strategy statistics
                 if self.strat_writer and position:
@@ -547,8 +733,8 @@ class ScriptRunner:
 
             # Reset library variables
             _reset_lib_vars(lib)
-            # Reset function isolation
-            function_isolation.reset()
+            # Release function isolation, the store is cleared by the next run
+            function_isolation.detach()
 
     def run(self, on_progress: Callable[[datetime], None] | None = None):
         """
@@ -617,6 +803,9 @@ class ScriptRunner:
         except Exception:
             pass
         self._step_iter = None
+        iso_store = getattr(self, "_iso_store", None)
+        if iso_store is not None:
+            iso_store.clear()
 
         # script 모듈 언로드해서 다음에 완전히 새로 import 되도록 만들기
         module_name = None
@@ -660,7 +849,7 @@ class ScriptRunner:
         self.last_bar_index = 0
         self.first_price = None
         self.last_price = None
-        self.equity_curve = []
+        self.equity_curve = array('d')
         self.tz = None
         # Reset request.security context only when the runner is fully destroyed.
         try:
@@ -685,3 +874,55 @@ class ScriptRunner:
     @property
     def all_ohlcv(self):
         return self._all_ohlcv
+
+
+def _run_job(script_path: Path, data_path: Path, runner_kwargs: dict[str, Any]) -> Path:
+    """
+    Run one script on one OHLCV file, in a worker process
+
+    :param script_path: The path to the script to run
+    :param data_path: The path of the .ohlcv file, the syminfo is loaded from the .toml next to it
+    :param runner_kwargs: Extra keyword arguments of ScriptRunner (plot_path, trade_path, ...)
+    :return: The data path of the finished job
+    """
+    from .ohlcv_file import OHLCVReader
+    from .exchange_policy import tradingview_hides_zero_volume
+
+    syminfo = SymInfo.load_toml(data_path.with_suffix(".toml"))
+    with OHLCVReader(data_path) as reader:
+        ohlcv = list(reader.read_from(reader.start_timestamp, reader.end_timestamp,
+                                      skip_zero_volume=tradingview_hides_zero_volume(syminfo.prefix)))
+
+    runner = ScriptRunner(script_path, iter(ohlcv), syminfo, last_bar_index=len(ohlcv) - 1,
+                          preload_ohlcv=ohlcv, **runner_kwargs)
+    try:
+        runner.run()
+    finally:
+        runner.destroy()
+    return data_path
+
+
+def run_many(script_path: Path, jobs: Iterable[tuple[Path, dict[str, Any]]],
+             workers: int | None = None) -> list[Path]:
+    """
+    Run the same script on many OHLCV files in parallel.
+
+    Every job runs in its own process, because the lib module state (syminfo, per-bar series)
+    is global to the process. Only paths are sent to the workers, the .ohlcv files are read
+    (memory mapped) by the workers themselves.
+
+    :param script_path: The path to the script to run
+    :param jobs: (data_path, runner_kwargs) pairs, runner_kwargs are passed to ScriptRunner
+    :param workers: Number of worker processes, defaults to the number of CPUs
+    :return: The data paths of the finished jobs, in the order of the jobs
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = list(jobs)
+    # Transform the script once here, the workers load the compiled .pyc instead of all of them
+    # running the AST transformation at the same time
+    precompile_script(script_path)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(_run_job, script_path, data_path, runner_kwargs)
+                   for data_path, runner_kwargs in jobs]
+        return [future.result() for future in futures]
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TypeVar, Generic, Iterator, cast
+from typing import TypeVar, Generic, Iterable, Iterator, cast
 
 from types import ModuleType
 
@@ -160,6 +160,33 @@ class SeriesImpl(Generic[T]):
 
         return value
 
+    def extend(self, values: Iterable[T | NA[T]], last_bar_index: int) -> None:
+        """
+        Adds the values of consecutive new bars at once, the same as calling add() for each
+        value with lib.bar_index increasing by one up to last_bar_index, but without reading lib.
+        The first value must belong to a newer bar than the last added one.
+
+        :param values: The values to be added, oldest first.
+        :param last_bar_index: The bar index of the last value.
+        """
+        buffer = self._buffer
+        capacity = self._capacity
+        size = self._size
+        write_pos = self._write_pos
+        for value in values:
+            if size < capacity:
+                buffer[write_pos] = value
+                size += 1
+                write_pos += 1
+            else:
+                if write_pos >= capacity:
+                    write_pos = 0
+                buffer[write_pos] = value
+                write_pos += 1
+        self._size = size
+        self._write_pos = write_pos
+        self._last_bar_index = last_bar_index
+
     def set(self, value: T | NA[T]) -> T | NA[T]:
         """
         Overwrites the most recently added (current) candle value.
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+from typing import Sequence
 
 from ..types.na import NA
 from ..lib.strategy import Trade
@@ -187,7 +188,7 @@ class StrategyStatistics:
 def calculate_strategy_statistics(
         position: Position,
         initial_capital: float,
-        equity_curve: list[float] | None = None,
+        equity_curve: Sequence[float] | None = None,
         first_price: float | None = None,
         last_price: float | None = None
 ) -> StrategyStatistics:
@@ -196,7 +197,7 @@ def calculate_strategy_statistics(
 
     :param position: Position object containing all trade data
     :param initial_capital: Initial capital for percentage calculations
-    :param equity_curve: List of equity values for Sharpe/Sortino calculations
+    :param equity_curve: Sequence of equity values (e.g. a float array) for Sharpe/Sortino calculations
     :param first_price: First price for buy & hold calculation
     :param last_price: Last price for buy & hold calculation
     :return: StrategyStatistics object with all calculated metrics
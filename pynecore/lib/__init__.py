@@ -129,7 +129,7 @@ def max_bars_back(var: Any, num: int) -> None:
 # noinspection PyShadowingNames
 def _get_dt(time: int | None = None, timezone: str | None = None) -> datetime:
     """ Get datetime object from time and timezone """
-    dt = _bar_state._datetime if time is None else datetime.fromtimestamp(time / 1000, UTC)
+    dt = _bar_datetime() if time is None else datetime.fromtimestamp(time / 1000, UTC)
     assert dt is not None
     return dt.astimezone(_parse_timezone(timezone))
 
@@ -830,11 +830,36 @@ class _BarState(_threading.local):
         self._time = 0
         self.last_bar_time = 0
         self._datetime = datetime.fromtimestamp(0, UTC)
+        # Exchange timezone for the lazily materialized ``_datetime`` (see _set_bar_time)
+        self._datetime_tz = None
 
 
 _bar_state = _BarState()
 
 
+def _bar_datetime() -> datetime:
+    """Bar datetime of the calling thread, built from ``_time`` on first access after _set_bar_time."""
+    state = _bar_state
+    dt = state._datetime
+    if dt is None:
+        dt = state._datetime = datetime.fromtimestamp(state._time / 1000, UTC).astimezone(state._datetime_tz)
+    return dt
+
+
+def _set_bar_time(time_ms: int, tz) -> None:
+    """
+    Set the per-bar time of the calling thread. The ``_datetime`` object (a UTC datetime plus a
+    zoneinfo conversion) is only constructed if something actually reads it during the bar.
+
+    :param time_ms: Bar open time in milliseconds (PineScript time representation)
+    :param tz: Exchange timezone to convert ``_datetime`` to
+    """
+    state = _bar_state
+    state._time = state.last_bar_time = time_ms
+    state._datetime = None
+    state._datetime_tz = tz
+
+
 class _LibModule(_ModuleType):
     """Module type for ``pynecore.lib`` whose per-bar fields resolve to the
     calling thread's :data:`_bar_state`. The ``property`` data descriptors
@@ -849,6 +874,9 @@ def _make_bar_property(_name):
 
 for _field in _BAR_STATE_FIELDS:
     setattr(_LibModule, _field, _make_bar_property(_field))
+# `_datetime` is materialized on read, as _set_bar_time only stores the timestamp
+_LibModule._datetime = property(lambda _self: _bar_datetime(),
+                                lambda _self, _value: setattr(_bar_state, "_datetime", _value))
 
 # Swap the live module object's type so the descriptors take effect.
 sys.modules[__name__].__class__ = _LibModule
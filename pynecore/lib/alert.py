@@ -6,12 +6,24 @@ This is a callable module, so the module itself is both a function and a namespa
 from __future__ import annotations
 
 import datetime
+import json
+import re
+import time
 from json import JSONDecodeError
 
+try:
+    # Use typer for nice colored output if available
+    import typer
+except ImportError:
+    typer = None
+
 from ..core.callable_module import CallableModule
 
 from ..types.alert import AlertEnum
 
+# Wraps an unquoted "message" value in double quotes
+_ALERT_FIX_RE = re.compile(r'"message"\s*:\s*(?![{["0-9])([A-Za-z][A-Za-z0-9 ]*)')
+
 #
 # Module object
 #
@@ -40,19 +52,19 @@ def alert(
     :param message: Alert message to display
     :param freq: Alert frequency (currently ignored)
     """
+    # Fallback to simple print, also for plain text alerts
+    if typer is None or '"message"' not in message:
+        print(f"🚨 {message}")
+        return
+
     try:
-        # Try to use typer for nice colored output
-        import typer
-        import json
-        import re
-
-        current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-        # Wrap the string in double quotes if it is passed without being enclosed in double quotes.
-        s = re.sub(r'"message"\s*:\s*(?![{["0-9])([A-Za-z][A-Za-z0-9 ]*)',
-                   r'"message": "\1"',
-                   message)
-        data = json.loads(s)
+        current_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
+
+        try:
+            data = json.loads(message)
+        except JSONDecodeError:
+            # Wrap the string in double quotes if it is passed without being enclosed in double quotes.
+            data = json.loads(_ALERT_FIX_RE.sub(r'"message": "\1"', message))
         timestamp = int(int(data.get('timestamp', 0)) / 1000)
         bar_time = datetime.datetime.fromtimestamp(timestamp) if timestamp else None
         bar_time_str = f"[{bar_time}]" if bar_time else ""
@@ -61,9 +73,6 @@ def alert(
 
         typer.secho(f"[{current_time}] {bar_time_str} 🚨  {message}",
                     fg=typer.colors.BRIGHT_YELLOW, bold=True)
-    except ImportError:
-        # Fallback to simple print
-        print(f"🚨 {message}")
     except (JSONDecodeError, KeyError):
         print(f"🚨 {message}")
     except Exception as e:
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
-from typing import Any, Callable
+from operator import attrgetter
+from typing import Any, Callable, Iterable
 import sys
 import os
+import re
 import copy
 
 from ..core.resampler import Resampler
@@ -14,27 +18,86 @@ from . import barmerge
 from . import timeframe as timeframe_module
 
 
+# Series the transformer created for lib sources, e.g. "__series_main·__lib·close__"
+_LIB_SERIES_RE = re.compile(r"·__lib·(open|high|low|close|volume|hl2|hlc3|ohlc4|hlcc4)__")
+
+# Verbose request.security tracing, read once at import
+_DEBUG = os.environ.get("PYNE_DEBUG_REQUEST_SECURITY") == "1"
+
+# Number of series snapshots kept per timeframe
+_SNAPSHOT_CACHE_SIZE = 4
+
+# Number of HTF bar datetimes kept per timeframe
+_DATETIME_CACHE_SIZE = 8
+
+# Positions of the fields in the tuples returned by SecurityContext._bar_values_at()
+_FIELD_INDEX = {
+    "open": 0, "high": 1, "low": 2, "close": 3, "volume": 4,
+    "hl2": 5, "hlc3": 6, "ohlc4": 7, "hlcc4": 8,
+}
+
+# Per-bar lib state that SecurityContext.evaluate() overrides, saved and restored positionally
+_EVAL_STATE_FIELDS = (
+    "open", "high", "low", "close", "volume", "hl2", "hlc3", "ohlc4", "hlcc4",
+    "bar_index", "last_bar_index", "_time", "last_bar_time", "_datetime",
+)
+_get_eval_state = attrgetter(*_EVAL_STATE_FIELDS)
+
+
+@dataclass
+class _BarColumns:
+    """HTF bars as parallel columns (struct of arrays) instead of a dict per bar"""
+    time: array = field(default_factory=lambda: array("q"))
+    open: array = field(default_factory=lambda: array("d"))
+    high: array = field(default_factory=lambda: array("d"))
+    low: array = field(default_factory=lambda: array("d"))
+    close: array = field(default_factory=lambda: array("d"))
+    volume: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def append(self, time: int, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        self.time.append(time)
+        self.open.append(open_)
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+        self.volume.append(volume)
+
+
 @dataclass
 class _TimeframeCache:
     resampler: Resampler
-    bars: list[dict] = field(default_factory=list)
-    base_to_high: list[int] = field(default_factory=list)
-    is_closed: list[bool] = field(default_factory=list)
+    bars: _BarColumns = field(default_factory=_BarColumns)
+    base_to_high: array = field(default_factory=lambda: array("q"))
+    is_closed: bytearray = field(default_factory=bytearray)
     series_map: dict[str, SeriesImpl] = field(default_factory=dict)
     series_fields: dict[str, str] = field(default_factory=dict)
     last_synced_index: int = -1
     last_bar_time: int | None = None
     last_refreshed_base_index: int | None = None
-    series_snapshots: dict[int, dict[str, "SeriesImpl"]] = field(default_factory=dict)
+    # SecurityContext._base_version the cache was last updated for, and the HTF bar of the
+    # current base bar then (-1 if it has none)
+    synced_version: int = -1
+    current_high_index: int = -1
+    # Isolated series of recent high indexes, least recently used first
+    series_snapshots: OrderedDict[int, dict[str, "SeriesImpl"]] = field(default_factory=OrderedDict)
+    # Last result of SecurityContext._bar_values_at()
+    cached_values_index: int = -1
+    cached_values: tuple[float, ...] = ()
+    # Datetimes of recent HTF bar times (seconds), least recently used first
+    datetimes: OrderedDict[int, datetime] = field(default_factory=OrderedDict)
 
 
 @dataclass
 class _ExprCache:
+    code: Any = None
     last_committed_index: int = -1
     last_value: Any = NA()
     last_htf_ohlcv: tuple | None = None  # (open, high, low, close) for lookahead_on change detection
-    pre_eval_snapshot: dict[Any, dict[str, Any]] | None = None
-    persistent_snapshot: dict[Any, dict[str, Any]] | None = None
+    pre_eval_snapshot: list[tuple[Any, str, Any]] | None = None
+    persistent_snapshot: list[tuple[Any, str, Any]] | None = None
     scope_id: str | None = None
     function_cache: dict[Any, Any] = field(default_factory=dict)
     pre_eval_function_snapshot: dict[Any, dict[str, Any]] | None = None
@@ -82,13 +145,29 @@ class SecurityContext:
     def __init__(self, script_module, lib_module):
         self._script_module = script_module
         self._lib = lib_module
+        # The thread-local bar state behind the lib properties, accessed directly by evaluate().
+        # Its raw `_datetime` may be None (materialized lazily by lib), which is kept as is.
+        self._bar_state = getattr(lib_module, "_bar_state", lib_module)
+        # Receives the _DEBUG trace, falls back to print()
+        log_mod = getattr(lib_module, "log", None)
+        self._log_info = getattr(log_mod, "info", None) if log_mod else None
         self._base_bars: list[Any] = []
         self._base_bar_index: int = -1
         self._last_updated_base_index: int | None = None
+        # Bumped on every change of the base bars, the caches only need updating when it changed
+        self._base_version = 0
         self._cache: dict[str, _TimeframeCache] = {}
-        self._expr_cache: dict[tuple[str, Any], _ExprCache] = {}
+        # timeframe -> id(expression code) -> cache, code objects hash slowly (their whole content)
+        self._expr_cache: dict[str, dict[int, _ExprCache]] = {}
         self._persistent_modules: list[_PersistentModule] = []
+        self._has_persistents = False
+        # Size of sys.modules at the last scan, a changed size means modules were (un)loaded
+        self._sys_modules_len = -1
         self._collect_persistent_modules()
+        # Timeframe string -> length in ms, None for timeframes in_seconds() cannot parse
+        self._tf_ms_cache: dict[str, int | None] = {}
+        # (series name, lib field) pairs of the script module, collected on first use
+        self._series_catalog: list[tuple[str, str]] | None = None
 
     def update_base_bar(self, candle: Any, bar_index: int) -> None:
         if bar_index == len(self._base_bars):
@@ -97,16 +176,21 @@ class SecurityContext:
             self._base_bars[bar_index] = candle
         self._base_bar_index = bar_index
         self._last_updated_base_index = bar_index
+        self._base_version += 1
 
     def _collect_persistent_modules(self) -> None:
         modules = []
-        for module in sys.modules.values():
-            if module is None or not hasattr(module, "__dict__"):
+        loaded = list(sys.modules.values())
+        for module in loaded:
+            module_dict = getattr(module, "__dict__", None)
+            if module_dict is None:
                 continue
-            keys = [k for k in module.__dict__.keys() if k.startswith("__persistent_")]
+            keys = [k for k in module_dict if k.startswith("__persistent_")]
             if keys:
                 modules.append(_PersistentModule(module=module, keys=keys))
         self._persistent_modules = modules
+        self._has_persistents = bool(modules)
+        self._sys_modules_len = len(loaded)
 
     def prefill_base_bars(self, bars: list[Any]) -> None:
         # Preload base bars for backtests without consuming a live iterator.
@@ -114,21 +198,27 @@ class SecurityContext:
             return
         # print(f"prefill base bars len: {len(bars)}, last bar: {bars[-1]}, last bar -1: {bars[-2]}")
         self._base_bars = bars
-
-    def _snapshot_persistents(self) -> dict[Any, dict[str, Any]]:
-        snapshot: dict[Any, dict[str, Any]] = {}
+        self._base_version += 1
+
+    def _snapshot_persistents(self) -> list[tuple[Any, str, Any]] | None:
+        # Pick up modules imported since the last scan
+        if len(sys.modules) != self._sys_modules_len:
+            self._collect_persistent_modules()
+        # No persistent variables anywhere: nothing to isolate, callers skip the restore
+        if not self._has_persistents:
+            return None
+        snapshot: list[tuple[Any, str, Any]] = []
         for entry in self._persistent_modules:
-            module_snapshot = {}
+            module = entry.module
+            module_dict = module.__dict__
             for key in entry.keys:
-                module_snapshot[key] = getattr(entry.module, key)
-            snapshot[entry.module] = module_snapshot
+                snapshot.append((module, key, module_dict[key]))
         return snapshot
 
     @staticmethod
-    def _restore_persistents(snapshot: dict[Any, dict[str, Any]]) -> None:
-        for module, values in snapshot.items():
-            for key, value in values.items():
-                setattr(module, key, value)
+    def _restore_persistents(snapshot: list[tuple[Any, str, Any]]) -> None:
+        for module, key, value in snapshot:
+            setattr(module, key, value)
 
     @staticmethod
     def _snapshot_function_cache(func_cache: dict[Any, Any]) -> dict[Any, dict[str, Any]]:
@@ -194,19 +284,20 @@ class SecurityContext:
 
     def _create_cache(self, timeframe: str) -> _TimeframeCache:
         cache = _TimeframeCache(resampler=Resampler.get_resampler(timeframe))
-        for name in dir(self._script_module):
-            if not name.startswith("__series_"):
-                continue
-            if "·__lib·" not in name:
-                continue
-            field = None
-            for candidate in ("open", "high", "low", "close", "volume", "hl2", "hlc3", "ohlc4", "hlcc4"):
-                if f"·__lib·{candidate}__" in name:
-                    field = candidate
-                    break
-            if field:
-                cache.series_map[name] = SeriesImpl()
-                cache.series_fields[name] = field
+        if self._series_catalog is None:
+            catalog = []
+            for name in sorted(vars(self._script_module)):
+                if not name.startswith("__series_"):
+                    continue
+                match = _LIB_SERIES_RE.search(name)
+                if match:
+                    # Interned, so the script globals and series map lookups compare by identity
+                    catalog.append((sys.intern(name), sys.intern(match.group(1))))
+            self._series_catalog = catalog
+
+        for name, field_name in self._series_catalog:
+            cache.series_map[name] = SeriesImpl()
+            cache.series_fields[name] = field_name
 
         return cache
 
@@ -225,21 +316,26 @@ class SecurityContext:
         if first_base_idx is None:
             return
         # Recalculate OHLCV from all LTF candles in this HTF bar
-        bar = cache.bars[last_htf_idx]
+        bars = cache.bars
         first_candle = self._base_bars[first_base_idx]
-        bar["open"] = float(first_candle.open)
-        bar["high"] = float(first_candle.high)
-        bar["low"] = float(first_candle.low)
-        bar["close"] = float(first_candle.close)
-        bar["volume"] = float(first_candle.volume)
+        high_val = float(first_candle.high)
+        low_val = float(first_candle.low)
+        close_val = first_candle.close
+        volume_val = float(first_candle.volume)
         for i in range(first_base_idx + 1, len(self._base_bars)):
             if i >= len(cache.base_to_high) or cache.base_to_high[i] != last_htf_idx:
                 break
             candle = self._base_bars[i]
-            bar["high"] = max(bar["high"], float(candle.high))
-            bar["low"] = min(bar["low"], float(candle.low))
-            bar["close"] = float(candle.close)
-            bar["volume"] += float(candle.volume)
+            high_val = max(high_val, float(candle.high))
+            low_val = min(low_val, float(candle.low))
+            close_val = candle.close
+            volume_val += float(candle.volume)
+        bars.open[last_htf_idx] = first_candle.open
+        bars.high[last_htf_idx] = high_val
+        bars.low[last_htf_idx] = low_val
+        bars.close[last_htf_idx] = close_val
+        bars.volume[last_htf_idx] = volume_val
+        cache.cached_values_index = -1
 
     def _should_refresh_last_htf_bar(self, cache: _TimeframeCache) -> bool:
         idx = self._last_updated_base_index
@@ -262,81 +358,166 @@ class SecurityContext:
 
         if len(cache.base_to_high) >= len(self._base_bars):
             return
-        for idx in range(len(cache.base_to_high), len(self._base_bars)):
-            candle = self._base_bars[idx]
-            bar_time_ms = cache.resampler.get_bar_time(int(candle.timestamp * 1000))
+        # The last HTF bar may change below
+        cache.cached_values_index = -1
+        if len(self._base_bars) - len(cache.base_to_high) > 1:
+            # Catching up on many bars at once (e.g. prefilled backtest bars)
+            self._update_cache_bulk(cache, len(cache.base_to_high))
+            return
+        # A single new base bar (the live case)
+        bars = cache.bars
+        base_to_high = cache.base_to_high
+        idx = len(base_to_high)
+        candle = self._base_bars[idx]
+        bar_time_ms = cache.resampler.get_bar_time(int(candle.timestamp * 1000))
+        bar_time_sec = int(bar_time_ms // 1000)
+        if cache.last_bar_time is None or bar_time_sec != cache.last_bar_time:
+            # The float arrays convert the candle values themselves
+            bars.append(bar_time_sec, candle.open, candle.high, candle.low, candle.close, candle.volume)
+            cache.last_bar_time = bar_time_sec
+        else:
+            last = len(bars) - 1
+            # Comparisons instead of max()/min() calls, with the same result (NaN included)
+            high_val = float(candle.high)
+            if high_val > bars.high[last]:
+                bars.high[last] = high_val
+            low_val = float(candle.low)
+            if low_val < bars.low[last]:
+                bars.low[last] = low_val
+            bars.close[last] = candle.close
+            bars.volume[last] += float(candle.volume)
+
+        base_to_high.append(len(bars) - 1)
+        cache.is_closed.append(False)
+        # No branch for the first bar: index -1 then is the same, just appended entry
+        cache.is_closed[idx - 1] = base_to_high[idx - 1] != base_to_high[idx]
+
+    def _update_cache_bulk(self, cache: _TimeframeCache, start_idx: int) -> None:
+        """Aggregate all base bars from start_idx, one HTF bar (run of base bars) at a time."""
+        base_bars = self._base_bars
+        end_idx = len(base_bars)
+        bar_times = cache.resampler.get_bar_times(
+            [int(base_bars[i].timestamp * 1000) for i in range(start_idx, end_idx)])
+        bars = cache.bars
+        base_to_high = cache.base_to_high
+        is_closed = cache.is_closed
+        is_closed.extend(bytes(end_idx - start_idx))
+
+        run_start = start_idx
+        while run_start < end_idx:
+            bar_time_ms = bar_times[run_start - start_idx]
+            run_end = run_start + 1
+            while run_end < end_idx and bar_times[run_end - start_idx] == bar_time_ms:
+                run_end += 1
+
             bar_time_sec = int(bar_time_ms // 1000)
+            first = base_bars[run_start]
             if cache.last_bar_time is None or bar_time_sec != cache.last_bar_time:
-                bar = {
-                    "time": bar_time_sec,
-                    "open": float(candle.open),
-                    "high": float(candle.high),
-                    "low": float(candle.low),
-                    "close": float(candle.close),
-                    "volume": float(candle.volume),
-                }
-                cache.bars.append(bar)
+                # Open and close are only stored, the float arrays convert them
+                open_val = first.open
+                high_val = float(first.high)
+                low_val = float(first.low)
+                close_val = first.close
+                volume_val = float(first.volume)
+                first_update = run_start + 1
+                new_bar = True
+                # The previous base bar was the last one of the previous HTF bar
+                if run_start > 0:
+                    is_closed[run_start - 1] = True
+            else:
+                # Continue the last (partial) HTF bar
+                last = len(bars) - 1
+                open_val = bars.open[last]
+                high_val = bars.high[last]
+                low_val = bars.low[last]
+                close_val = bars.close[last]
+                volume_val = bars.volume[last]
+                first_update = run_start
+                new_bar = False
+
+            for i in range(first_update, run_end):
+                candle = base_bars[i]
+                value = float(candle.high)
+                if value > high_val:
+                    high_val = value
+                value = float(candle.low)
+                if value < low_val:
+                    low_val = value
+                close_val = candle.close
+                volume_val += float(candle.volume)
+
+            if new_bar:
+                bars.append(bar_time_sec, open_val, high_val, low_val, close_val, volume_val)
                 cache.last_bar_time = bar_time_sec
             else:
-                bar = cache.bars[-1]
-                bar["high"] = max(bar["high"], float(candle.high))
-                bar["low"] = min(bar["low"], float(candle.low))
-                bar["close"] = float(candle.close)
-                bar["volume"] += float(candle.volume)
+                bars.high[last] = high_val
+                bars.low[last] = low_val
+                bars.close[last] = close_val
+                bars.volume[last] = volume_val
 
-            cache.base_to_high.append(len(cache.bars) - 1)
-            if idx > 0:
-                cache.is_closed[idx - 1] = cache.base_to_high[idx - 1] != cache.base_to_high[idx]
-            cache.is_closed.append(False)
+            base_to_high.extend([len(bars) - 1] * (run_end - run_start))
+            run_start = run_end
 
     def _get_cache(self, timeframe: str) -> _TimeframeCache:
         cache = self._cache.get(timeframe)
         if cache is None:
             cache = self._create_cache(timeframe)
-            self._cache[timeframe] = cache
-        self._update_cache(cache)
+            # Timeframes computed at runtime (not literals) get interned keys as well
+            self._cache[sys.intern(timeframe)] = cache
+        # Other request.security calls of the same base bar find the cache up to date
+        if cache.synced_version != self._base_version:
+            self._update_cache(cache)
+            cache.synced_version = self._base_version
+            base_index = self._base_bar_index
+            cache.current_high_index = (cache.base_to_high[base_index]
+                                        if 0 <= base_index < len(cache.base_to_high) else -1)
         return cache
 
-    def _bar_values(self, bar: dict) -> dict[str, float]:
-        open_val = bar["open"]
-        high_val = bar["high"]
-        low_val = bar["low"]
-        close_val = bar["close"]
-        return {
-            "open": open_val,
-            "high": high_val,
-            "low": low_val,
-            "close": close_val,
-            "volume": bar["volume"],
-            "hl2": (high_val + low_val) / 2.0,
-            "hlc3": (high_val + low_val + close_val) / 3.0,
-            "ohlc4": (open_val + high_val + low_val + close_val) / 4.0,
-            "hlcc4": (high_val + low_val + 2 * close_val) / 4.0,
-        }
+    @staticmethod
+    def _bar_values_at(cache: _TimeframeCache, index: int) -> tuple[float, ...]:
+        """Source values of an HTF bar, in _FIELD_INDEX order"""
+        # Most base bars map to the same HTF bar as the previous one
+        if cache.cached_values_index == index:
+            return cache.cached_values
+        bars = cache.bars
+        open_val = bars.open[index]
+        high_val = bars.high[index]
+        low_val = bars.low[index]
+        close_val = bars.close[index]
+        values = (
+            open_val,
+            high_val,
+            low_val,
+            close_val,
+            bars.volume[index],
+            (high_val + low_val) / 2.0,
+            (high_val + low_val + close_val) / 3.0,
+            (open_val + high_val + low_val + close_val) / 4.0,
+            (high_val + low_val + 2 * close_val) / 4.0,
+        )
+        cache.cached_values_index = index
+        cache.cached_values = values
+        return values
 
     def _sync_series(self, cache: _TimeframeCache, high_index: int) -> None:
         if high_index < 0:
             return
-        old_bar_index = self._lib.bar_index
-        old_last_bar_index = self._lib.last_bar_index
-        for i in range(cache.last_synced_index + 1, high_index + 1):
-            bar = cache.bars[i]
-            values = self._bar_values(bar)
-            self._lib.bar_index = i
-            self._lib.last_bar_index = i
+        series_fields = cache.series_fields
+        if cache.last_synced_index < high_index:
+            # One extend() per series with the new HTF bars, a column is built once per field
+            start = cache.last_synced_index + 1
+            columns: dict[str, Iterable[float]] = {}
             for series_name, series_obj in cache.series_map.items():
-                field = cache.series_fields[series_name]
-                series_obj.add(values[field])
-        if high_index <= cache.last_synced_index:
-            bar = cache.bars[high_index]
-            values = self._bar_values(bar)
-            self._lib.bar_index = high_index
-            self._lib.last_bar_index = high_index
+                field_name = series_fields[series_name]
+                column = columns.get(field_name)
+                if column is None:
+                    column = columns[field_name] = self._field_column(cache.bars, field_name,
+                                                                      high_index + 1, start)
+                series_obj.extend(column, high_index)
+        else:
+            values = self._bar_values_at(cache, high_index)
             for series_name, series_obj in cache.series_map.items():
-                field = cache.series_fields[series_name]
-                series_obj.set(values[field])
-        self._lib.bar_index = old_bar_index
-        self._lib.last_bar_index = old_last_bar_index
+                series_obj.set(values[_FIELD_INDEX[series_fields[series_name]]])
         cache.last_synced_index = max(cache.last_synced_index, high_index)
 
     def _build_series_snapshot(self, cache: _TimeframeCache, high_index: int) -> dict[str, SeriesImpl]:
@@ -344,65 +525,105 @@ class SecurityContext:
         if high_index < 0:
             return {name: SeriesImpl() for name in cache.series_map.keys()}
 
+        snapshots = cache.series_snapshots
         # Return cached snapshot if available
-        if high_index in cache.series_snapshots:
-            return cache.series_snapshots[high_index]
+        snapshot = snapshots.get(high_index)
+        if snapshot is not None:
+            snapshots.move_to_end(high_index)
+            return snapshot
 
-        prev_snapshot = cache.series_snapshots.get(high_index - 1)
+        prev_snapshot = snapshots.get(high_index - 1)
         if prev_snapshot is not None:
             temp_series_map: dict[str, SeriesImpl] = {}
+            values = self._bar_values_at(cache, high_index)
             for name, series_obj in prev_snapshot.items():
                 snap = _SeriesSnapshot.from_series(series_obj)
                 cloned = SeriesImpl(max_bars_back=snap.max_bars_back)
                 snap.restore(cloned)
+                cloned.extend((values[_FIELD_INDEX[cache.series_fields[name]]],), high_index)
                 temp_series_map[name] = cloned
-            bar = cache.bars[high_index]
-            values = self._bar_values(bar)
-            old_bar_index = self._lib.bar_index
-            old_last_bar_index = self._lib.last_bar_index
-            try:
-                self._lib.bar_index = high_index
-                self._lib.last_bar_index = high_index
-                for series_name, series_obj in temp_series_map.items():
-                    field = cache.series_fields[series_name]
-                    series_obj.add(values[field])
-            finally:
-                self._lib.bar_index = old_bar_index
-                self._lib.last_bar_index = old_last_bar_index
-            cache.series_snapshots[high_index] = temp_series_map
-            return temp_series_map
-
-        temp_series_map: dict[str, SeriesImpl] = {
-            name: SeriesImpl() for name in cache.series_map.keys()
-        }
-
-        old_bar_index = self._lib.bar_index
-        old_last_bar_index = self._lib.last_bar_index
-        try:
-            for i in range(high_index + 1):
-                bar = cache.bars[i]
-                values = self._bar_values(bar)
-                self._lib.bar_index = i
-                self._lib.last_bar_index = i
-                for series_name, series_obj in temp_series_map.items():
-                    field = cache.series_fields[series_name]
-                    series_obj.add(values[field])
-        finally:
-            self._lib.bar_index = old_bar_index
-            self._lib.last_bar_index = old_last_bar_index
+        else:
+            # Build every series from its whole column at once
+            bars = cache.bars
+            end = high_index + 1
+            temp_series_map = {}
+            for name in cache.series_map.keys():
+                series_obj = SeriesImpl()
+                series_obj.extend(self._field_column(bars, cache.series_fields[name], end), high_index)
+                temp_series_map[name] = series_obj
 
         # Cache the snapshot for reuse
-        cache.series_snapshots[high_index] = temp_series_map
+        snapshots[high_index] = temp_series_map
+        if len(snapshots) > _SNAPSHOT_CACHE_SIZE:
+            snapshots.popitem(last=False)
         return temp_series_map
 
+    @staticmethod
+    def _field_column(bars: _BarColumns, field_name: str, end: int, start: int = 0) -> Iterable[float]:
+        """Values of one source field for the HTF bars start..end-1, same arithmetic as _bar_values_at()"""
+        if field_name in ("open", "high", "low", "close", "volume"):
+            return getattr(bars, field_name)[start:end]
+        h, l = bars.high[start:end], bars.low[start:end]
+        if field_name == "hl2":
+            return [(hi + lo) / 2.0 for hi, lo in zip(h, l)]
+        c = bars.close[start:end]
+        if field_name == "hlc3":
+            return [(hi + lo + cl) / 3.0 for hi, lo, cl in zip(h, l, c)]
+        if field_name == "ohlc4":
+            return [(op + hi + lo + cl) / 4.0 for op, hi, lo, cl in zip(bars.open[start:end], h, l, c)]
+        return [(hi + lo + 2 * cl) / 4.0 for hi, lo, cl in zip(h, l, c)]
+
+    @staticmethod
+    def _bar_datetime(cache: _TimeframeCache, bar_time_sec: int) -> datetime:
+        """UTC datetime of an HTF bar time, shared by all evaluations landing on the same bar"""
+        datetimes = cache.datetimes
+        dt = datetimes.get(bar_time_sec)
+        if dt is not None:
+            datetimes.move_to_end(bar_time_sec)
+            return dt
+        dt = datetimes[bar_time_sec] = datetime.fromtimestamp(bar_time_sec, UTC)
+        if len(datetimes) > _DATETIME_CACHE_SIZE:
+            datetimes.popitem(last=False)
+        return dt
+
+    def _timeframe_ms(self, timeframe: str) -> int | None:
+        """Length of a timeframe in ms, parsed once per context"""
+        tf_ms_cache = self._tf_ms_cache
+        if timeframe in tf_ms_cache:
+            return tf_ms_cache[timeframe]
+        try:
+            tf_ms = timeframe_module.in_seconds(timeframe) * 1000
+        except Exception:  # noqa: BLE001
+            tf_ms = None
+        tf_ms_cache[timeframe] = tf_ms
+        return tf_ms
+
+    def _debug(self, msg: str) -> None:
+        """Emit a _DEBUG trace message, callers build the message only if _DEBUG is set"""
+        if self._log_info is not None:
+            self._log_info(msg)
+        else:
+            print(msg)
+
+    def _get_expr_cache(self, timeframe: str, expr: Callable[[], Any]) -> _ExprCache:
+        """Cache by expression code so lookahead_on can reuse committed values"""
+        code = expr.__code__
+        tf_expr_cache = self._expr_cache.get(timeframe)
+        if tf_expr_cache is None:
+            tf_expr_cache = self._expr_cache[sys.intern(timeframe)] = {}
+        expr_cache = tf_expr_cache.get(id(code))
+        # The code object is kept by its cache entry, so its id cannot be reused by another one
+        if expr_cache is None:
+            expr_cache = tf_expr_cache[id(code)] = _ExprCache(code=code)
+        return expr_cache
+
     def evaluate(self, timeframe: str, expr: Callable[[], Any], lookahead) -> Any:
-        debug_enabled = os.environ.get("PYNE_DEBUG_REQUEST_SECURITY") == "1"
         if not self._base_bars or self._base_bar_index < 0:
             return NA()
         cache = self._get_cache(timeframe)
-        if self._base_bar_index >= len(cache.base_to_high):
+        high_index = cache.current_high_index
+        if high_index < 0:
             return NA()
-        high_index = cache.base_to_high[self._base_bar_index]
         base_tf_ms = None
         requested_tf_ms = None
         force_snapshot = False
@@ -416,15 +637,9 @@ class SecurityContext:
                     base_tf_ms = delta_ms
 
             if base_tf_ms is None:
-                try:
-                    base_tf_ms = timeframe_module.in_seconds(self._lib.syminfo.period) * 1000
-                except Exception:  # noqa: BLE001
-                    base_tf_ms = None
+                base_tf_ms = self._timeframe_ms(self._lib.syminfo.period)
 
-            try:
-                requested_tf_ms = timeframe_module.in_seconds(timeframe) * 1000
-            except Exception:  # noqa: BLE001
-                requested_tf_ms = None
+            requested_tf_ms = self._timeframe_ms(timeframe)
 
             if requested_tf_ms is None or base_tf_ms is None:
                 high_index -= 1
@@ -433,8 +648,7 @@ class SecurityContext:
                 high_index -= 1
                 force_snapshot = True
 
-            if debug_enabled:
-                log_mod = getattr(self._lib, "log", None)
+            if _DEBUG:
                 msg = (
                     f"[request.security] tf={timeframe} lookahead={lookahead} "
                     f"base_idx={self._base_bar_index} high_idx={high_index} "
@@ -442,39 +656,32 @@ class SecurityContext:
                     f"prev_time_ms={prev_time_ms if 'prev_time_ms' in locals() else None} "
                     f"base_tf_ms={base_tf_ms} requested_tf_ms={requested_tf_ms}"
                 )
-                if log_mod and hasattr(log_mod, "info"):
-                    log_mod.info(msg)
-                else:
-                    print(msg)
-        elif debug_enabled:
-            log_mod = getattr(self._lib, "log", None)
-            msg = (
-                f"[request.security] tf={timeframe} lookahead={lookahead} "
-                f"base_idx={self._base_bar_index} high_idx={high_index}"
-            )
-            if log_mod and hasattr(log_mod, "info"):
-                log_mod.info(msg)
-            else:
-                print(msg)
-        if high_index < 0:
-            return NA()
-        # Cache by expression code so lookahead_on can reuse committed values.
-        expr_key = (timeframe, expr.__code__)
-        expr_cache = self._expr_cache.get(expr_key)
-        if expr_cache is None:
-            expr_cache = _ExprCache()
-            self._expr_cache[expr_key] = expr_cache
-        should_commit = (high_index != expr_cache.last_committed_index)
-        # For lookahead_on, check if HTF bar's OHLCV has changed within the same HTF bar
-        bar_changed = False
-        if lookahead == barmerge.lookahead_on and not should_commit:
-            bar = cache.bars[high_index]
-            current_ohlcv = (bar["open"], bar["high"], bar["low"], bar["close"])
-            if expr_cache.last_htf_ohlcv == current_ohlcv:
-                # HTF bar unchanged, return cached value
-                return expr_cache.last_value
-            # HTF bar changed, need to recalculate (will update cache below)
-            bar_changed = True
+                self._debug(msg)
+            if high_index < 0:
+                return NA()
+            expr_cache = self._get_expr_cache(timeframe, expr)
+            should_commit = (high_index != expr_cache.last_committed_index)
+            bar_changed = False
+        else:
+            if _DEBUG:
+                msg = (
+                    f"[request.security] tf={timeframe} lookahead={lookahead} "
+                    f"base_idx={self._base_bar_index} high_idx={high_index}"
+                )
+                self._debug(msg)
+            expr_cache = self._get_expr_cache(timeframe, expr)
+            should_commit = (high_index != expr_cache.last_committed_index)
+            # For lookahead_on, check if HTF bar's OHLCV has changed within the same HTF bar,
+            # before anything is synced or saved for the evaluation
+            bar_changed = False
+            if not should_commit:
+                bars = cache.bars
+                if expr_cache.last_htf_ohlcv == (bars.open[high_index], bars.high[high_index],
+                                                 bars.low[high_index], bars.close[high_index]):
+                    # HTF bar unchanged, return cached value
+                    return expr_cache.last_value
+                # HTF bar changed, need to recalculate (will update cache below)
+                bar_changed = True
 
         # Use a snapshot when we would otherwise reuse a longer series buffer.
         use_snapshot_series = force_snapshot or high_index < cache.last_synced_index
@@ -484,36 +691,35 @@ class SecurityContext:
         else:
             series_map = self._build_series_snapshot(cache, high_index)
 
-        bar = cache.bars[high_index]
-        values = self._bar_values(bar)
-        if debug_enabled:
-            log_mod = getattr(self._lib, "log", None)
-            bar_time = datetime.fromtimestamp(bar["time"], UTC).isoformat()
+        bars = cache.bars
+        bar_time_sec = bars.time[high_index]
+        values = self._bar_values_at(cache, high_index)
+        if _DEBUG:
+            bar_time = datetime.fromtimestamp(bar_time_sec, UTC).isoformat()
             prev_time = None
             if high_index > 0:
-                prev_time = datetime.fromtimestamp(cache.bars[high_index - 1]["time"], UTC).isoformat()
+                prev_time = datetime.fromtimestamp(bars.time[high_index - 1], UTC).isoformat()
             prev_close = None
             if high_index > 0:
-                prev_close = cache.bars[high_index - 1]["close"]
+                prev_close = bars.close[high_index - 1]
             msg = (
                 f"[request.security] tf={timeframe} high_idx_time={bar_time} "
-                f"prev_high_idx_time={prev_time} bars_len={len(cache.bars)} "
-                f"close={bar['close']} prev_close={prev_close} "
+                f"prev_high_idx_time={prev_time} bars_len={len(bars)} "
+                f"close={bars.close[high_index]} prev_close={prev_close} "
                 f"last_synced={cache.last_synced_index} use_snapshot={use_snapshot_series} "
                 f"force_snapshot={force_snapshot} base_tf_ms={base_tf_ms} requested_tf_ms={requested_tf_ms}"
             )
-            if log_mod and hasattr(log_mod, "info"):
-                log_mod.info(msg)
-            else:
-                print(msg)
+            self._debug(msg)
 
-        original_series = {}
+        # A list of pairs instead of a dict, and no buffer on self: expressions may call
+        # request.security again, which re-enters evaluate() before this one restores
+        script_globals = self._script_module.__dict__
+        original_series: list[tuple[str, Any]] = []
         for name, series_obj in series_map.items():
-            if hasattr(self._script_module, name):
-                original_series[name] = getattr(self._script_module, name)
-            setattr(self._script_module, name, series_obj)
-            if debug_enabled and "__lib·close__" in name:
-                log_mod = getattr(self._lib, "log", None)
+            if name in script_globals:
+                original_series.append((name, script_globals[name]))
+            script_globals[name] = series_obj
+            if _DEBUG and "__lib·close__" in name:
                 try:
                     sample = [series_obj[i] for i in range(4)]
                 except Exception:  # noqa: BLE001
@@ -522,27 +728,10 @@ class SecurityContext:
                     f"[request.security] tf={timeframe} series={name} "
                     f"len={len(series_obj)} sample0-3={sample}"
                 )
-                if log_mod and hasattr(log_mod, "info"):
-                    log_mod.info(msg)
-                else:
-                    print(msg)
-
-        original_values = {
-            "open": self._lib.open,
-            "high": self._lib.high,
-            "low": self._lib.low,
-            "close": self._lib.close,
-            "volume": self._lib.volume,
-            "hl2": self._lib.hl2,
-            "hlc3": self._lib.hlc3,
-            "ohlc4": self._lib.ohlc4,
-            "hlcc4": self._lib.hlcc4,
-            "bar_index": self._lib.bar_index,
-            "last_bar_index": self._lib.last_bar_index,
-            "_time": self._lib._time,
-            "last_bar_time": self._lib.last_bar_time,
-            "_datetime": self._lib._datetime,
-        }
+                self._debug(msg)
+
+        state = self._bar_state
+        original_values = _get_eval_state(state)
         global_snapshot = None
         restore_snapshot = None
         original_scope_id = getattr(self._script_module, "__scope_id__", None)
@@ -571,26 +760,17 @@ class SecurityContext:
             if bar_changed and expr_cache.pre_eval_function_snapshot is not None:
                 self._restore_function_cache(expr_cache.function_cache, expr_cache.pre_eval_function_snapshot)
         try:
-            self._lib.open = values["open"]
-            self._lib.high = values["high"]
-            self._lib.low = values["low"]
-            self._lib.close = values["close"]
-            self._lib.volume = values["volume"]
-            self._lib.hl2 = values["hl2"]
-            self._lib.hlc3 = values["hlc3"]
-            self._lib.ohlc4 = values["ohlc4"]
-            self._lib.hlcc4 = values["hlcc4"]
-            self._lib.bar_index = high_index
-            self._lib.last_bar_index = high_index
-            bar_time_ms = int(bar["time"] * 1000)
-            self._lib._time = bar_time_ms
-            self._lib.last_bar_time = bar_time_ms
-            self._lib._datetime = datetime.fromtimestamp(bar["time"], UTC)
+            (state.open, state.high, state.low, state.close, state.volume,
+             state.hl2, state.hlc3, state.ohlc4, state.hlcc4) = values
+            state.bar_index = state.last_bar_index = high_index
+            bar_time_ms = int(bar_time_sec * 1000)
+            state._time = state.last_bar_time = bar_time_ms
+            state._datetime = self._bar_datetime(cache, bar_time_sec)
             result = expr()
             if should_commit:
                 expr_cache.last_committed_index = high_index
             expr_cache.last_value = result
-            expr_cache.last_htf_ohlcv = (bar["open"], bar["high"], bar["low"], bar["close"])
+            expr_cache.last_htf_ohlcv = values[:4]
             if lookahead == barmerge.lookahead_on:
                 expr_cache.persistent_snapshot = self._snapshot_persistents()
             return result
@@ -601,10 +781,10 @@ class SecurityContext:
             if global_snapshot is not None:
                 # Restore global persistent state to avoid cross-series contamination.
                 self._restore_persistents(global_snapshot)
-            for name, original in original_series.items():
-                setattr(self._script_module, name, original)
-            for key, value in original_values.items():
-                setattr(self._lib, key, value)
+            for name, original in original_series:
+                script_globals[name] = original
+            for key, value in zip(_EVAL_STATE_FIELDS, original_values):
+                setattr(state, key, value)
 
 
 def security(symbol: str, timeframe: str, expression: Callable[[], Any] | Any,
@@ -363,11 +363,20 @@ def format_time(time: int, fmt: str | None = None, tz: str | None = None) -> str
     if not fmt:
         fmt = "yyyy-MM-ddTHH:mm:ssZ"
 
+    # The same timestamps are formatted many times (e.g. trade entries and exits on the same bar)
+    return _format_time(time, fmt, tz or _syminfo.timezone)
+
+
+@lru_cache(maxsize=4096)
+def _format_time(time: int, fmt: str, tz: str) -> str:
+    """
+    Cached implementation of format_time with resolved format and timezone
+    """
     # Convert timestamp to datetime
     dt = datetime.fromtimestamp(time / 1000, UTC)
 
     # Convert timezone using _parse_timezone
-    dt = dt.astimezone(_parse_timezone(tz or _syminfo.timezone))
+    dt = dt.astimezone(_parse_timezone(tz))
 
     # Convert format and apply
     py_fmt = _datatime_fmt_tv2py(fmt)
@@ -6,9 +6,12 @@ class RequestSecurityTransformer(ast.NodeTransformer):
     """
     Wrap the 3rd argument of request.security(...) in a zero-arg lambda for lazy evaluation.
     """
+    _EMPTY_ARGS = ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[])
+
     def __init__(self):
         super().__init__()
         self._found = False
+        self._has_marker = False
 
     @staticmethod
     def _is_request_security_call(node: ast.Call) -> bool:
@@ -22,39 +25,36 @@ class RequestSecurityTransformer(ast.NodeTransformer):
         return False
 
     def visit_Call(self, node: ast.Call) -> ast.AST:
-        node = cast(ast.Call, self.generic_visit(node))
-        if not self._is_request_security_call(node):
-            return node
+        # Single attribute compare for the vast majority of calls, the full match only for `*.security`
+        if (getattr(node.func, "attr", None) != "security"
+                or not self._is_request_security_call(node)):
+            return self.generic_visit(node)
         self._found = True
+        # The arguments may contain nested request.security calls too
+        node = cast(ast.Call, self.generic_visit(node))
         if len(node.args) < 3:
             return node
         expr = node.args[2]
         if isinstance(expr, ast.Lambda):
             return node
-        lambda_node = ast.Lambda(
-            args=ast.arguments(
-                posonlyargs=[],
-                args=[],
-                kwonlyargs=[],
-                kw_defaults=[],
-                defaults=[]
-            ),
-            body=expr
-        )
+        # The empty signature is shared by all wrappers, no transformer changes lambda arguments
+        lambda_node = ast.Lambda(args=self._EMPTY_ARGS, body=expr)
         setattr(lambda_node, "_skip_function_isolation", True)
         ast.copy_location(lambda_node, expr)
         node.args[2] = lambda_node
         return node
 
+    def visit_Assign(self, node: ast.Assign) -> ast.AST:
+        # Remember an existing marker during the main walk, so visit_Module need not rescan the body
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id == "__has_request_security__":
+                self._has_marker = True
+        return self.generic_visit(node)
+
     def visit_Module(self, node: ast.Module) -> ast.AST:
         node = cast(ast.Module, self.generic_visit(node))
-        if not self._found:
+        if not self._found or self._has_marker:
             return node
-        for stmt in node.body:
-            if isinstance(stmt, ast.Assign):
-                for target in stmt.targets:
-                    if isinstance(target, ast.Name) and target.id == "__has_request_security__":
-                        return node
         assign = ast.Assign(
             targets=[ast.Name(id="__has_request_security__", ctx=ast.Store())],
             value=ast.Constant(True),
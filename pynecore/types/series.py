@@ -14,6 +14,8 @@ class Series(Generic[T]):
     This is the runtime, do nothing implementation of the Series type. The actual Series behavior is
     implented in AST Transformers and the SeriesImpl class.
     """
+    # No instance __dict__ for subclasses with slots (Source), Series itself is never instantiated
+    __slots__ = ()
 
     def __new__(cls, val: T) -> T:
         return val
@@ -1,6 +1,19 @@
 from __future__ import annotations
+import sys
+
 from .series import Series
 
+# The lib module, bound on first use: importing it here at module level would be circular
+_LIB = None
+
+
+def _get_lib():
+    global _LIB
+    if _LIB is None:
+        from pynecore import lib
+        _LIB = lib
+    return _LIB
+
 
 class Source(Series[float]):
     """
@@ -26,17 +39,18 @@ class Source(Series[float]):
     AST transformation is missed (e.g., nested functions, closures). When called,
     they resolve the actual value from lib module dynamically.
     """
+    __slots__ = ('name',)
 
     def __new__(cls, name: str) -> Source:
         obj = object.__new__(cls)
-        setattr(obj, "name", name)
+        obj.name = sys.intern(name)
         return obj
 
     def __repr__(self) -> str:
-        return f"Source({getattr(self, 'name')})"
+        return f"Source({self.name})"
 
     def __str__(self) -> str:
-        return getattr(self, 'name')
+        return self.name
 
     def _get_value(self):
         """Get actual value from lib module.
@@ -49,9 +63,13 @@ class Source(Series[float]):
         strategy keep computing on wrong values). A clear error surfaces the
         real problem instead of producing silently incorrect trades.
         """
-        from pynecore import lib
-        name = getattr(self, 'name')
-        value = getattr(lib, name, None)
+        lib = _LIB or _get_lib()
+        name = self.name
+        # The per-bar sources live in lib's thread-local bar state, read it without the
+        # property descriptors of the lib module in between
+        value = getattr(lib._bar_state, name, None)
+        if value is None:
+            value = getattr(lib, name, None)
         if value is None or isinstance(value, Source):
             raise RuntimeError(
                 f"lib.{name} is still a Source placeholder when its value was "
@@ -65,9 +83,10 @@ class Source(Series[float]):
 
     def _resolve(self, other):
         """Resolve self and other to actual values"""
-        self_val = self._get_value()
-        other_val = other._get_value() if isinstance(other, Source) else other
-        return self_val, other_val
+        # Exact type check: Source has no subclasses, and the usual operand is a plain number
+        if other.__class__ is Source:
+            return self._get_value(), other._get_value()
+        return self._get_value(), other
 
     # Comparison operators
     def __gt__(self, other):
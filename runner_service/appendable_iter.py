@@ -24,9 +24,12 @@ class AppendableIterable(Generic[T]):
         self._feeding_thread: Optional[Thread] = None
         self._on_error = on_error
         self._auto_close_when_empty = auto_close_when_empty
+        # 백그라운드 공급이 끝났는지 (공급 스레드가 없으면 처음부터 끝난 상태)
+        self._producer_done = True
 
         if base_iter is not None:
             if feed_in_background:
+                self._producer_done = False
                 # 백그라운드로 base_iter를 계속 흘려 넣기
                 self._feeding_thread = Thread(
                     target=self._feed_base_iter, args=(base_iter,), daemon=True
@@ -54,7 +57,10 @@ class AppendableIterable(Generic[T]):
         finally:
             # base_iter 공급 종료. 닫지는 않습니다. 외부에서 계속 append할 수 있음
             with self._cv:
-                self._cv.notify_all()
+                self._producer_done = True
+                # 공급 종료를 기다리는 소비자는 auto_close_when_empty일 때만 있음
+                if self._auto_close_when_empty:
+                    self._cv.notify_all()
 
     def append(self, item: T) -> None:
         with self._cv:
@@ -64,21 +70,22 @@ class AppendableIterable(Generic[T]):
             self._cv.notify()
 
     def extend(self, items: Iterable[T]) -> None:
+        # 입력(제너레이터일 수 있음)은 lock 밖에서 모두 꺼내고, lock 안에서는 한 번에 붙이기만 함
+        buf = items if isinstance(items, list) else list(items)
         with self._cv:
             if self._closed:
                 raise RuntimeError("Already closed")
-            any_added = False
-            for it in items:
-                self._q.append(it)
-                any_added = True
-            if any_added:
+            if buf:
+                self._q.extend(buf)
                 self._cv.notify_all()
 
     def replace_last(self, item: T) -> None:
         with self._cv:
-            if not self._q:
-                raise IndexError("Queue is empty, nothing to replace")
-            self._q[-1] = item
+            # 한 번의 연산으로 교체: lock 없이 popleft 하는 소비자와 경합하지 않음
+            try:
+                self._q[-1] = item
+            except IndexError:
+                raise IndexError("Queue is empty, nothing to replace") from None
             self._cv.notify()
 
     def close(self) -> None:
@@ -91,17 +98,22 @@ class AppendableIterable(Generic[T]):
         self.close()
 
     def __iter__(self) -> Iterator[T]:
+        q = self._q
         while True:
-            with self._cv:
-                while not self._q and not self._closed:
-                    if self._auto_close_when_empty:
-                        # 큐가 비었고 더 기다리지 않고 종료
+            # deque.popleft()는 원자적이므로 아이템이 쌓여 있는 동안은 lock 없이 꺼냄
+            try:
+                item = q.popleft()
+            except IndexError:
+                # 큐가 비었을 때만 lock을 잡고 생산자를 기다림
+                with self._cv:
+                    while not q and not self._closed:
+                        if self._auto_close_when_empty and self._producer_done:
+                            # 큐가 비었고 base_iter 공급도 끝났으면 더 기다리지 않고 종료
+                            return
+                        self._cv.wait()
+                    if not q:
                         return
-                    self._cv.wait()
-                if self._q:
-                    item = self._q.popleft()
-                else:
-                    return
+                continue
             yield item
 
     @property
@@ -4,28 +4,39 @@ import argparse
 import asyncio
 import json
 import os
+import random
+import re
+import struct
 import sys
 import tomllib
 import ast
 from script_hash import compute_script_hashes, load_script_hashes, write_script_hashes
 from collections import deque
-from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache, partial
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Optional
 
-import numpy as np
 import websockets
 
 from appendable_iter import AppendableIterable
 from pynecore.cli.app import app_state
 from pynecore.core.ohlcv_file import OHLCVReader
 from pynecore.core.exchange_policy import tradingview_hides_zero_volume
+from pynecore.core.realtime_timeframe import parse_tf
 from pynecore.core.script_runner import ScriptRunner
 from pynecore.core.syminfo import SymInfo
 from pynecore.types.ohlcv import OHLCV
 
 DATA_WS = ""
+# Bounds of the data_service reconnect backoff, in seconds
+WS_RECONNECT_DELAY_MIN = 1.0
+WS_RECONNECT_DELAY_MAX = 30.0
+# Received messages buffered for main() before the reader waits for it to catch up
+WS_INBOX_SIZE = 1024
 SCRIPT_PATH: Path | None = None
 SCRIPT_HASH_PATH: Path | None = None  # CSV path for persisted script hashes.
 PLOT_PATH: Path | None = None  # per-session plot CSV path (from --plot-path).
@@ -46,12 +57,44 @@ trade_event_queue = deque()
 plot_options = {}
 # Event queue for plotchar events
 plotchar_event_queue = deque()
+# JSON codec of the websocket messages: orjson if it is installed, the stdlib otherwise.
+# Event batches can hold every historical trade after a full re-emit, so both are compact.
+# data_service reads text frames, so the encoder returns str.
+try:
+    import orjson
+
+    def encode_json(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    decode_json = orjson.loads
+except ImportError:
+    encode_json = json.JSONEncoder(separators=(",", ":")).encode
+    decode_json = json.loads
+
+# Fixed control messages, encoded once
+RESET_HISTORY_FRAME = encode_json({"type": "reset_history"})
+SCRIPT_MODIFIED_FRAME = encode_json({"type": "script_modified"})
+RUNNER_READY_FRAME = encode_json({"type": "runner_ready"})
+ACK_PRERUN_AFTER_HISTORY_FRAME = encode_json({"type": "ack_prerun_ready_after_history_download"})
+
+# Message types that start a pre-run, checked with one set lookup
+PRERUN_MESSAGE_TYPES = frozenset({"prerun_ready", "prerun_ready_after_history_download"})
 
 
 def extract_script_title(script_path: Path) -> str:
     try:
-        source = script_path.read_text(encoding="utf-8")
-        tree = ast.parse(source, filename=str(script_path))
+        st = script_path.stat()
+    except OSError:
+        return "No title"
+    # Parsed once per script version (mtime and size), reconnects and prereruns reuse it
+    return _extract_script_title(str(script_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=8)
+def _extract_script_title(path: str, mtime_ns: int, size: int) -> str:
+    try:
+        source = Path(path).read_text(encoding="utf-8")
+        tree = ast.parse(source, filename=path)
     except Exception:
         return "No title"
 
@@ -87,6 +130,20 @@ def build_script_info_payload(script_path: Path, title: str | None = None) -> di
     }
 
 
+@lru_cache(maxsize=4)
+def _encode_script_info(path: str, mtime_ns: int, size: int, title: str | None) -> str:
+    return encode_json(build_script_info_payload(Path(path), title))
+
+
+def script_info_frame(script_path: Path, title: str | None = None) -> str:
+    """
+    Encoded script_info message. It carries the whole script source, so it is only rebuilt
+    when the script file changed (by mtime and size) or the title is different.
+    """
+    st = script_path.stat()
+    return _encode_script_info(str(script_path), st.st_mtime_ns, st.st_size, title)
+
+
 def format_timeframe(period: str | None) -> str:
     """Convert a syminfo period (e.g. "1", "5", "60", "D") to a TradingView-style
     timeframe label (e.g. "1m", "5m", "1h", "1D")."""
@@ -104,25 +161,48 @@ def format_timeframe(period: str | None) -> str:
     return mapping.get(period.upper(), period)
 
 
+# HTTP session for the webhook / telegram requests, created on first use.
+# Keeps the connections to the same hosts alive between alerts.
+_http_session = None
+
+
+def get_http_session():
+    global _http_session
+    if _http_session is None:
+        import requests
+        _http_session = requests.Session()
+    return _http_session
+
+
+# The webhook / telegram requests block for up to their timeouts, so they run on a worker thread
+# instead of the event loop. One worker keeps the alerts in order and the HTTP session single-threaded.
+_webhook_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webhook")
+
+
+def _report_webhook_error(future: Future) -> None:
+    e = future.exception()
+    if e is not None:
+        print(f"[runner] Failed to send alert: {e}")
+
+
+# Unquoted "message" value of an alert message, e.g. {"message": long entry}
+_UNQUOTED_MESSAGE = re.compile(r'"message"\s*:\s*(?![{["0-9])([A-Za-z][A-Za-z0-9 ]*)')
+
+
 def send_webhook_message(webhook_url: str, message: str, *, script_title: str | None,
                          timeframe: str | None, ticker: str | None,
                          telegram_notification: bool, telegram_token: str | None,
                          telegram_chat_id: str | None) -> None:
-    import json
-    import re
-    import datetime
-    import requests
-
-    # Wrap unquoted message fields so JSON parsing succeeds.
-    s = re.sub(r'"message"\s*:\s*(?![{["0-9])([A-Za-z][A-Za-z0-9 ]*)',
-               r'"message": "\1"',
-               message)
-    parsed = json.loads(s)
+    try:
+        parsed = decode_json(message)
+    except ValueError:
+        # Wrap unquoted message fields so JSON parsing succeeds.
+        parsed = decode_json(_UNQUOTED_MESSAGE.sub(r'"message": "\1"', message))
     json_alert_message = parsed.get('message', '')
     if json_alert_message != '' and webhook_url:
         payload = json_alert_message
         try:
-            response = requests.post(webhook_url, json=payload, timeout=(5, 10))
+            response = get_http_session().post(webhook_url, json=payload, timeout=(5, 10))
             response.raise_for_status()
             print("Webhook response:", response.json())
         except Exception as e:
@@ -130,7 +210,7 @@ def send_webhook_message(webhook_url: str, message: str, *, script_title: str |
 
     if telegram_notification and telegram_token and telegram_chat_id:
         # Wall-clock time at which the notification is sent.
-        time_str = datetime.datetime.now().strftime('%H:%M:%S')
+        time_str = datetime.now().strftime('%H:%M:%S')
 
         # Signal original: keep the raw message body, rendering nested dicts readably.
         if isinstance(json_alert_message, str):
@@ -151,7 +231,7 @@ def send_webhook_message(webhook_url: str, message: str, *, script_title: str |
             # "parse_mode": "Markdown"  # 굵게/이탤릭 등 쓰고 싶으면 선택
         }
         try:
-            response = requests.get(url, params=payload, timeout=(5, 10))
+            response = get_http_session().get(url, params=payload, timeout=(5, 10))
             response.raise_for_status()
             print("Telegram response:", response.json())
         except Exception as e:
@@ -164,6 +244,32 @@ def clear_local_state() -> None:
     plot_options.clear()
 
 
+async def flush_events(ws, confirmed_bar_index: int, confirmed_bar_time: int | None) -> None:
+    """
+    Send the queued trade and plotchar events, followed by the plot options, to data_service
+    as a single JSON array message (data_service handles the events of an array in order).
+    The events are produced by script callbacks while the runner steps, and are sent right after
+    the step loop, in the same order relative to the other messages of the run.
+    The queues are only cleared when the send succeeded, so failed events are sent with the next batch.
+    """
+    batch = [*trade_event_queue, *plotchar_event_queue]
+    if plot_options:
+        batch.append({
+            "type": "plot_options",
+            "data": plot_options,
+            "confirmed_bar_index": confirmed_bar_index,
+            "confirmed_bar_time": confirmed_bar_time,
+        })
+    if not batch:
+        return
+    try:
+        await ws.send(encode_json(batch))
+        trade_event_queue.clear()
+        plotchar_event_queue.clear()
+    except Exception as e:
+        print(f"[runner] Failed to send events: {e}")
+
+
 def on_entry_event(trade, runner=None):
     """Callback for entry events.
 
@@ -254,7 +360,8 @@ def on_alert_event(message: str, runner: ScriptRunner):
         return
 
     syminfo = getattr(runner, "syminfo", None)
-    send_webhook_message(
+    future = _webhook_executor.submit(
+        send_webhook_message,
         webhook_url=webhook_url if do_webhook else "",
         message=message,
         script_title=script.title,
@@ -264,6 +371,7 @@ def on_alert_event(message: str, runner: ScriptRunner):
         telegram_token=telegram_token,
         telegram_chat_id=telegram_chat_id,
     )
+    future.add_done_callback(_report_webhook_error)
 
 
 def hide_zero_volume_bars(exchange: str | None) -> bool:
@@ -282,6 +390,33 @@ def is_visible_ohlcv(ohlcv: OHLCV, *, hide_zero_volume: bool) -> bool:
     return True
 
 
+@lru_cache(maxsize=4)
+def _parse_realtime_config(path: str, mtime_ns: int) -> dict:
+    """Parsed realtime_trade.toml, keyed by its mtime so edits are picked up on the next prerun."""
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_realtime_config(config_path: Path) -> dict:
+    """
+    Load realtime_trade.toml. The file is only re-parsed when it changed, the caller gets
+    its own copy of the top level and the realtime/webhook sections.
+    """
+    realtime_config = dict(_parse_realtime_config(str(config_path), config_path.stat().st_mtime_ns))
+    # Always populate webhook_url / telegram credentials on the script so the
+    # per-session runtime toggle can gate sending in both directions without a
+    # restart. Actual on/off lives in WEBHOOK_ENABLED / TELEGRAM_ENABLED, which
+    # the hub updates live via the "webhook_config" WS message.
+    _rt_sec = dict(realtime_config.get("realtime", {}))
+    _rt_sec["enabled"] = True
+    realtime_config["realtime"] = _rt_sec
+    _wh_sec = dict(realtime_config.get("webhook", {}))
+    _wh_sec["enabled"] = True
+    _wh_sec["telegram_notification"] = True
+    realtime_config["webhook"] = _wh_sec
+    return realtime_config
+
+
 def ready_scrip_runner(script_path: Path, data_path: Path, data_toml_path: Path) -> tuple[ScriptRunner,
 AppendableIterable[OHLCV], OHLCVReader] | None:
     """
@@ -309,14 +444,10 @@ AppendableIterable[OHLCV], OHLCVReader] | None:
     if size == 0:
         reader.close()
         return None
-    ohlcv_iter: Iterator[OHLCV] = iter(preload_list)
-    # Prepare a mutable iterator.
-    if ohlcv_iter is not None:
-        stream: AppendableIterable[OHLCV] = AppendableIterable(ohlcv_iter, feed_in_background=True)
-    else:
-        return None
+    # Prepare a mutable iterator. The history is already in memory, so it is queued up front
+    # instead of being fed by a background thread.
+    stream: AppendableIterable[OHLCV] = AppendableIterable(preload_list)
 
-    from pynecore.cli.app import app_state
     # Add lib directory to Python path for library imports
     lib_dir = app_state.scripts_dir / "lib"
     lib_path_added = False
@@ -340,40 +471,27 @@ AppendableIterable[OHLCV], OHLCVReader] | None:
         # Create script runner (this is where the import happens)
         config_dir = app_state.config_dir
         plot_path = PLOT_PATH if PLOT_PATH is not None else app_state.output_dir / f"{script_path.stem}.csv"
-        with open(config_dir / "realtime_trade.toml", "rb") as f:
-            realtime_config = tomllib.load(f)
-            # Always populate webhook_url / telegram credentials on the script so the
-            # per-session runtime toggle can gate sending in both directions without a
-            # restart. Actual on/off lives in WEBHOOK_ENABLED / TELEGRAM_ENABLED, which
-            # the hub updates live via the "webhook_config" WS message.
-            realtime_config = dict(realtime_config)
-            _rt_sec = dict(realtime_config.get("realtime", {}))
-            _rt_sec["enabled"] = True
-            realtime_config["realtime"] = _rt_sec
-            _wh_sec = dict(realtime_config.get("webhook", {}))
-            _wh_sec["enabled"] = True
-            _wh_sec["telegram_notification"] = True
-            realtime_config["webhook"] = _wh_sec
-            runner = ScriptRunner(script_path, stream, syminfo,
-                                  last_bar_index=size - 1,
-                                  plot_path=plot_path, strat_path=None, trade_path=None,
-                                  realtime_config=realtime_config,
-                                  custom_inputs={
-                                        # "bb1d_lower": bb1d_lower,
-                                        # "macro_high": macro_high,
-                                        # "macro_low": macro_low
-                                  },
-                                  preload_ohlcv=preload_list)
-            runner.init_step()
-
-            # Register trade event callbacks
-            runner.script.position.on_entry_callback = partial(on_entry_event, runner=runner)
-            runner.script.position.on_close_callback = partial(on_close_event, runner=runner)
-            runner.script.position.on_alert_callback = partial(on_alert_event, runner=runner)
-            # Register plot event callback
-            runner.script.on_plot_callback = on_plot_event
-            # Register plotchar event callback
-            runner.script.on_plotchar_callback = on_plotchar_event
+        realtime_config = load_realtime_config(config_dir / "realtime_trade.toml")
+        runner = ScriptRunner(script_path, stream, syminfo,
+                              last_bar_index=size - 1,
+                              plot_path=plot_path, strat_path=None, trade_path=None,
+                              realtime_config=realtime_config,
+                              custom_inputs={
+                                    # "bb1d_lower": bb1d_lower,
+                                    # "macro_high": macro_high,
+                                    # "macro_low": macro_low
+                              },
+                              preload_ohlcv=preload_list)
+        runner.init_step()
+
+        # Register trade event callbacks
+        runner.script.position.on_entry_callback = partial(on_entry_event, runner=runner)
+        runner.script.position.on_close_callback = partial(on_close_event, runner=runner)
+        runner.script.position.on_alert_callback = partial(on_alert_event, runner=runner)
+        # Register plot event callback
+        runner.script.on_plot_callback = on_plot_event
+        # Register plotchar event callback
+        runner.script.on_plotchar_callback = on_plotchar_event
     finally:
         # Remove lib directory from Python path
         if lib_path_added:
@@ -408,18 +526,16 @@ def get_runner_candle(runner: ScriptRunner, index: int) -> OHLCV | None:
     return candles[index]
 
 
+# OHLCV values as stored in the data file: 5 x float32
+_FLOAT32_OHLCV = struct.Struct("5f")
+
+
 def bar_list_to_ohlcv(bar: list) -> OHLCV:
     # bar: [ts_ms, o, h, l, c, v]
-    return OHLCV(
-        timestamp=int(bar[0] / 1000),
-        # Align realtime bars with file precision (float32) to avoid BB rounding drift.
-        open=float(np.float32(bar[1])),
-        high=float(np.float32(bar[2])),
-        low=float(np.float32(bar[3])),
-        close=float(np.float32(bar[4])),
-        volume=float(np.float32(bar[5])),
-        extra_fields={},
-    )
+    # Align realtime bars with file precision (float32) to avoid BB rounding drift.
+    # One pack/unpack rounds all five values the same way as np.float32() would.
+    open_, high, low, close, volume = _FLOAT32_OHLCV.unpack(_FLOAT32_OHLCV.pack(*bar[1:6]))
+    return OHLCV(int(bar[0] / 1000), open_, high, low, close, volume, {})
 
 
 def run_prerun_steps(runner: ScriptRunner, prerun_range: int) -> None:
@@ -432,7 +548,7 @@ def run_prerun_steps(runner: ScriptRunner, prerun_range: int) -> None:
         runner.plot_writer.flush()
 
 
-@dataclass
+@dataclass(slots=True)
 class RunnerCtx:
     runner: ScriptRunner
     stream: AppendableIterable[OHLCV] | None
@@ -440,31 +556,50 @@ class RunnerCtx:
     last_new_bar_ts_sec: int
 
 
-async def ws_loop():
+async def send_connect_handshake(ws) -> None:
+    """
+    Introduce the runner on a fresh data_service connection: client_hello, script_info and,
+    only when the script contents changed since the last run, reset_history.
+    Called by main() when it reads the reconnect marker of ws_reader().
+    """
+    try:
+        await ws.send(encode_json({"type": "client_hello", "role": "runner",
+                                  "session_id": SESSION_ID}))
+    except Exception:
+        pass
+    try:
+        if SCRIPT_PATH and SCRIPT_PATH.exists():
+            await ws.send(script_info_frame(SCRIPT_PATH))
+    except Exception as e:
+        print(f"[runner] Failed to send script_info (connect): {e}")
+    try:
+        if SCRIPT_PATH and SCRIPT_PATH.exists():
+            current_hashes = compute_script_hashes(SCRIPT_PATH)
+            previous_hashes = load_script_hashes(SCRIPT_HASH_PATH)
+            if current_hashes != previous_hashes:
+                # Only reset when script contents changed.
+                await ws.send(RESET_HISTORY_FRAME)
+                clear_local_state()
+                write_script_hashes(SCRIPT_HASH_PATH, current_hashes)
+    except Exception as e:
+        print(f"[runner] Failed to send reset_history: {e}")
+
+
+async def ws_reader(inbox: asyncio.Queue) -> None:
+    """
+    Keep the data_service connection up and put every received message into ``inbox``
+    as a ``(ws, raw)`` pair, in arrival order. Every new connection is announced first
+    with a ``(ws, None)`` reconnect marker, so main() does the connect handshake and the
+    state reset in order with the messages. Runs as its own task next to main().
+    """
+    # Reconnect delay in seconds, doubled (with jitter) on every failed attempt up to the cap
+    delay = WS_RECONNECT_DELAY_MIN
     while True:
         try:
-            async with websockets.connect(DATA_WS, ping_interval=None) as ws:
-                try:
-                    await ws.send(json.dumps({"type": "client_hello", "role": "runner",
-                                              "session_id": SESSION_ID}))
-                except Exception:
-                    pass
-                try:
-                    if SCRIPT_PATH and SCRIPT_PATH.exists():
-                        await ws.send(json.dumps(build_script_info_payload(SCRIPT_PATH)))
-                except Exception as e:
-                    print(f"[runner] Failed to send script_info (connect): {e}")
-                try:
-                    if SCRIPT_PATH and SCRIPT_PATH.exists():
-                        current_hashes = compute_script_hashes(SCRIPT_PATH)
-                        previous_hashes = load_script_hashes(SCRIPT_HASH_PATH)
-                        if current_hashes != previous_hashes:
-                            # Only reset when script contents changed.
-                            await ws.send(json.dumps({"type": "reset_history"}))
-                            clear_local_state()
-                            write_script_hashes(SCRIPT_HASH_PATH, current_hashes)
-                except Exception as e:
-                    print(f"[runner] Failed to send reset_history: {e}")
+            # data_service runs on the same host, permessage-deflate would only cost CPU
+            async with websockets.connect(DATA_WS, ping_interval=None, compression=None) as ws:
+                delay = WS_RECONNECT_DELAY_MIN
+                await inbox.put((ws, None))
 
                 async def keepalive():
                     while True:
@@ -475,25 +610,17 @@ async def ws_loop():
                             return
 
                 ka = asyncio.create_task(keepalive())
-
-                async for raw in ws:
-                    yield ws, raw
-
-                ka.cancel()
+                try:
+                    async for raw in ws:
+                        await inbox.put((ws, raw))
+                finally:
+                    # Also on errors: wait for the keepalive task to finish instead of leaking it
+                    ka.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await ka
         except Exception:
-            await asyncio.sleep(1)
-
-
-def parse_timeframe_to_ms(tf: str) -> int:
-    unit = tf[-1]
-    value = int(tf[:-1])
-
-    if unit == "m":
-        return value * 60 * 1000
-    elif unit == "h":
-        return value * 60 * 60 * 1000
-    else:
-        return value * 24 * 60 * 60 * 1000
+            await asyncio.sleep(delay + random.random() * 0.25)
+            delay = min(delay * 2, WS_RECONNECT_DELAY_MAX)
 
 
 def parse_runner_args() -> argparse.Namespace:
@@ -552,8 +679,9 @@ async def main():
     config_dir = app_state.config_dir
     realtime_config: dict = {}
     try:
-        with open(config_dir / "realtime_trade.toml", "rb") as f:
-            realtime_config = tomllib.load(f)
+        # Same cached parse as the prereruns use, so the first prerun does not re-parse the file
+        config_path = config_dir / "realtime_trade.toml"
+        realtime_config = _parse_realtime_config(str(config_path), config_path.stat().st_mtime_ns)
     except Exception:
         realtime_config = {}
     realtime_section: dict = realtime_config.get("realtime", {})
@@ -561,6 +689,8 @@ async def main():
     tf = _resolve(args.timeframe, "PYNEREAL_TIMEFRAME", realtime_section.get("timeframe", ""))
     if not tf:
         raise RuntimeError("timeframe is empty (args/env/realtime_trade.toml)")
+    # The timeframe is fixed for the session, resolve its length once
+    timeframe_ms = parse_tf(tf).ms
 
     pyne_section: dict = realtime_config.get("pyne", {})
     if pyne_section.get("no_logo", False):
@@ -606,7 +736,6 @@ async def main():
     TELEGRAM_ENABLED = _as_bool(_resolve(args.telegram_enabled, "PYNEREAL_TELEGRAM_ENABLED", None),
                                 bool(webhook_section.get("telegram_notification", False)))
 
-    from datetime import datetime
     started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(f"[{started_at}] [runner] started | session={SESSION_ID} tf={tf} "
           f"script={script_name} ws={DATA_WS}")
@@ -616,7 +745,6 @@ async def main():
     asyncio.create_task(_parent_watchdog(os.getppid()))
 
     ctx: Optional[RunnerCtx] = None
-    last_ws = None
     # Becomes True after the first pre_run completes; tells the hub to switch the
     # dashboard LED from amber (pre-running) to green. Reset on a fresh connection.
     ready_sent = False
@@ -628,342 +756,303 @@ async def main():
     # harmless: data_service dedupes by exact event.
     pending_full_reemit = False
 
-    async for ws, raw in ws_loop():
-        if ws is not last_ws:
-            last_ws = ws
-            pending_full_reemit = True
-            ready_sent = False
-        try:
-            msg = json.loads(raw)
-        except Exception:
-            continue
-
-        mtype = msg.get("type")
-
-        # -----------------------------
-        # Live per-session webhook toggle (decision 8-1)
-        # -----------------------------
-        if mtype == "webhook_config":
-            WEBHOOK_ENABLED = bool(msg.get("enabled", WEBHOOK_ENABLED))
-            TELEGRAM_ENABLED = bool(msg.get("telegram_notification", TELEGRAM_ENABLED))
-            WEBHOOK_URL = msg.get("url", WEBHOOK_URL) or ""
-            TELEGRAM_TOKEN = msg.get("telegram_token", TELEGRAM_TOKEN) or ""
-            TELEGRAM_CHAT_ID = msg.get("telegram_chat_id", TELEGRAM_CHAT_ID) or ""
-            # Only log when something is actually configured (skip the noisy all-off default).
-            if WEBHOOK_ENABLED or TELEGRAM_ENABLED or WEBHOOK_URL or TELEGRAM_TOKEN:
-                print(f"[runner] webhook_config: webhook={WEBHOOK_ENABLED} telegram={TELEGRAM_ENABLED} "
-                      f"url={'set' if WEBHOOK_URL else '-'} token={'set' if TELEGRAM_TOKEN else '-'}")
-            continue
-
-        # -----------------------------
-        # Pre script run stage
-        # -----------------------------
-        if (mtype == "prerun_ready") or (mtype == "prerun_ready_after_history_download"):
-            # Send ACK immediately for prerun_ready_after_history_download
-            if mtype == "prerun_ready_after_history_download":
-                try:
-                    await ws.send(json.dumps({"type": "ack_prerun_ready_after_history_download"}))
-                    # print("[runner] Sent ACK for prerun_ready_after_history_download")
-                except Exception as e:
-                    print(f"[runner] Failed to send ACK: {e}")
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=WS_INBOX_SIZE)
+    reader_task = asyncio.create_task(ws_reader(inbox))
 
-            ohlcv_path = Path(msg.get("ohlcv_path", ""))
-            toml_path = Path(msg.get("toml_path", ""))
-            if not ohlcv_path.exists() or not toml_path.exists():
-                print("[runner] prerun_ready received but file missing:", ohlcv_path, toml_path)
+    try:
+        while True:
+            ws, raw = await inbox.get()
+            if raw is None:
+                # Reconnect marker: every message after it belongs to this connection
+                pending_full_reemit = True
+                ready_sent = False
+                await send_connect_handshake(ws)
                 continue
-
-            # Prevent the duplicate prerun_ready event
-            if ctx is not None:
+            try:
+                msg = decode_json(raw)
+            except Exception:
                 continue
 
-            try:
-                current_hashes = compute_script_hashes(SCRIPT_PATH)
-                previous_hashes = load_script_hashes(SCRIPT_HASH_PATH)
-                if current_hashes != previous_hashes:
-                    pending_full_reemit = True
-                    await ws.send(json.dumps({"type": "script_modified"}))
-                    clear_local_state()
-                    write_script_hashes(SCRIPT_HASH_PATH, current_hashes)
-            except Exception as e:
-                print(f"[runner] Failed to send script_modified (prerun): {e}")
-
-            # Ready runner + stream
-            result = ready_scrip_runner(script_path, ohlcv_path, toml_path)
-            if result is None:
-                from datetime import datetime
-                print(f"[{datetime.now().strftime('%y-%m-%d %H:%M:%S')}] [runner] failed to prepare runner")
+            mtype = msg.get("type")
+
+            # -----------------------------
+            # Live per-session webhook toggle (decision 8-1)
+            # -----------------------------
+            if mtype == "webhook_config":
+                WEBHOOK_ENABLED = bool(msg.get("enabled", WEBHOOK_ENABLED))
+                TELEGRAM_ENABLED = bool(msg.get("telegram_notification", TELEGRAM_ENABLED))
+                WEBHOOK_URL = msg.get("url", WEBHOOK_URL) or ""
+                TELEGRAM_TOKEN = msg.get("telegram_token", TELEGRAM_TOKEN) or ""
+                TELEGRAM_CHAT_ID = msg.get("telegram_chat_id", TELEGRAM_CHAT_ID) or ""
+                # Only log when something is actually configured (skip the noisy all-off default).
+                if WEBHOOK_ENABLED or TELEGRAM_ENABLED or WEBHOOK_URL or TELEGRAM_TOKEN:
+                    print(f"[runner] webhook_config: webhook={WEBHOOK_ENABLED} telegram={TELEGRAM_ENABLED} "
+                          f"url={'set' if WEBHOOK_URL else '-'} token={'set' if TELEGRAM_TOKEN else '-'}")
                 continue
-            else:
-                runner, stream, reader = result
-                result = None
-
-            # print("=== Pre-run start (up to the last bar) ===")
-            size = runner.last_bar_index + 1
-            last_visible_bar = get_runner_candle(runner, runner.last_bar_index)
-            # In normal realtime pre-run, the file may already contain the open current bar.
-            # If that bar is visible, keep it in the stream for the next run_ready and
-            # pre-run only up to the last confirmed bar. If the raw last bar is a
-            # hidden zero-volume candle, the visible list already ends at a confirmed bar.
-            has_unconfirmed_visible_bar = (
-                last_visible_bar is not None
-                and reader.end_timestamp is not None
-                and int(last_visible_bar.timestamp) == int(reader.end_timestamp)
-            )
-            prerun_range = size - 1 if has_unconfirmed_visible_bar else size
-            runner.script.pre_run = True
-            if mtype == "prerun_ready_after_history_download":
-                prerun_range = size
-                runner.script.pre_run = False
-            elif pending_full_reemit:
-                # Fresh connection (runner restart/reconnect) or mid-run script edit:
-                # trades_history was (or may have been) cleared, and trade-event callbacks
-                # are pre_run-gated, so a normal (pre_run=True) prerun would NOT re-emit
-                # the historical markers, leaving the chart empty until a restart. Run this
-                # one prerun with pre_run=False so the gated callbacks re-emit all historical
-                # markers. prerun_range stays size-1: the last open bar is still left for
-                # run_ready, so no spurious last-bar alert fires (its fill bar isn't stepped).
-                runner.script.pre_run = False
-            await asyncio.to_thread(run_prerun_steps, runner, prerun_range)
-            pending_full_reemit = False
-
-            # First pre_run done -> tell the hub the chart plots are ready (LED green).
-            if not ready_sent:
-                try:
-                    await ws.send(json.dumps({"type": "runner_ready"}))
-                    ready_sent = True
-                except Exception as e:
-                    print(f"[runner] Failed to send runner_ready: {e}")
-            # print("=== Pre-run finished ===")
 
-            try:
-                title = runner.script.title or "No title"
-                await ws.send(json.dumps(build_script_info_payload(script_path, title)))
-            except Exception as e:
-                print(f"[runner] Failed to send script_info: {e}")
+            # -----------------------------
+            # Pre script run stage
+            # -----------------------------
+            if mtype in PRERUN_MESSAGE_TYPES:
+                # Send ACK immediately for prerun_ready_after_history_download
+                if mtype == "prerun_ready_after_history_download":
+                    try:
+                        await ws.send(ACK_PRERUN_AFTER_HISTORY_FRAME)
+                        # print("[runner] Sent ACK for prerun_ready_after_history_download")
+                    except Exception as e:
+                        print(f"[runner] Failed to send ACK: {e}")
 
-            # Send the visible last candle itself. A visible index can differ from the
-            # raw file index when OKX hidden zero-volume bars exist.
-            try:
-                last_bar = get_runner_candle(runner, runner.last_bar_index)
-                event = {
-                    "type": "last_bar_open_fix",
-                    "last_bar_index": runner.last_bar_index,
-                }
-                if last_bar is not None:
-                    event["data"] = ohlcv_open_fix_event_data(last_bar)
-                await ws.send(json.dumps(event))
-            except Exception as e:
-                print(f"[runner] Failed to send bar confirmation: {e}")
-
-            # Send trade events to data_service
-            if trade_event_queue:
-                try:
-                    await ws.send(json.dumps(list(trade_event_queue)))
-                    trade_event_queue.clear()
-                except Exception as e:
-                    print(f"[runner] Failed to send trade events: {e}")
+                ohlcv_path = Path(msg.get("ohlcv_path", ""))
+                toml_path = Path(msg.get("toml_path", ""))
+                if not ohlcv_path.exists() or not toml_path.exists():
+                    print("[runner] prerun_ready received but file missing:", ohlcv_path, toml_path)
+                    continue
 
-            # Send plotchar events to data_service
-            if plotchar_event_queue:
-                try:
-                    await ws.send(json.dumps(list(plotchar_event_queue)))
-                    plotchar_event_queue.clear()
-                except Exception as e:
-                    print(f"[runner] Failed to send plotchar events: {e}")
+                # Prevent the duplicate prerun_ready event
+                if ctx is not None:
+                    continue
 
-            # Send plot options to data_service
-            if plot_options:
                 try:
-                    # Plot CSV rows are keyed by candle timestamp. Timestamp lookup avoids
-                    # using a raw file index that may include hidden OKX bars.
-                    confirmed_bar_index = runner.last_bar_index - 1
-                    confirmed_bar = get_runner_candle(runner, confirmed_bar_index)
-                    confirmed_bar_time = int(confirmed_bar.timestamp) if confirmed_bar is not None else None
-                    plot_options_event = {
-                        "type": "plot_options",
-                        "data": plot_options,
-                        "confirmed_bar_index": confirmed_bar_index,
-                        "confirmed_bar_time": confirmed_bar_time,
-                    }
-                    await ws.send(json.dumps(plot_options_event))
-                    # print(f"[runner] Sent plot_options: {plot_options}")
+                    current_hashes = compute_script_hashes(SCRIPT_PATH)
+                    previous_hashes = load_script_hashes(SCRIPT_HASH_PATH)
+                    if current_hashes != previous_hashes:
+                        pending_full_reemit = True
+                        await ws.send(SCRIPT_MODIFIED_FRAME)
+                        clear_local_state()
+                        write_script_hashes(SCRIPT_HASH_PATH, current_hashes)
                 except Exception as e:
-                    print(f"[runner] Failed to send plot options: {e}")
+                    print(f"[runner] Failed to send script_modified (prerun): {e}")
 
-            if mtype == "prerun_ready":
-                # confirmed_bar_and_new_bar가 있다면 new bar ts를 추적에 사용
-                confirmed_bar_and_new_bar = msg.get("confirmed_bar_and_new_bar")
-                # print(f"[runner] pre_run confirmed_bar_and_new_bar: {confirmed_bar_and_new_bar}")
-                # print(f"[runner] stream last: {stream.q[-1]}")
-                last_new_ts_sec = 0
-                if isinstance(confirmed_bar_and_new_bar, list) and len(confirmed_bar_and_new_bar) == 2:
-                    last_new_ts_sec = int(confirmed_bar_and_new_bar[1][0] / 1000)
+                # Ready runner + stream
+                result = ready_scrip_runner(script_path, ohlcv_path, toml_path)
+                if result is None:
+                    print(f"[{datetime.now().strftime('%y-%m-%d %H:%M:%S')}] [runner] failed to prepare runner")
+                    continue
                 else:
-                    # fallback: Use end_timestamp from the file
-                    with OHLCVReader(ohlcv_path) as r:
-                        last_new_ts_sec = int(r.end_timestamp)
-                        r.close()
-
-                ctx = RunnerCtx(runner=runner, stream=stream, reader=reader, last_new_bar_ts_sec=last_new_ts_sec)
-                # print(f"[runner] prerun done. last_new_bar_ts_sec={ctx.last_new_bar_ts_sec}")
-            elif mtype == "prerun_ready_after_history_download":
-                runner.destroy()
-                stream.finish()
-                stream = None
-                reader.close()
-
-        # -----------------------------
-        # Script run stage
-        # -----------------------------
-        elif mtype == "run_ready":
-            if ctx is None:
-                continue
-
-            ohlcv_path = msg.get("ohlcv_path", "")
-            confirmed_bar_and_new_bar = msg.get("confirmed_bar_and_new_bar")
-            # print(f"[runner] run_ready confirmed_bar_and_new_bar: {confirmed_bar_and_new_bar}")
-            confirmed_bar = confirmed_bar_and_new_bar[0]
-            new_bar = confirmed_bar_and_new_bar[1]
-
-            confirmed_ohlcv = bar_list_to_ohlcv(confirmed_bar)
-            new_ohlcv = bar_list_to_ohlcv(new_bar)
-            hide_zero_volume = hide_zero_volume_bars(getattr(ctx.runner.syminfo, "prefix", None))
-            # confirmed_visible decides whether this just-closed candle should run one strategy step.
-            # new_visible decides whether the newly opened candle should be kept as the next open bar.
-            confirmed_visible = is_visible_ohlcv(confirmed_ohlcv, hide_zero_volume=hide_zero_volume)
-            new_visible = is_visible_ohlcv(new_ohlcv, hide_zero_volume=hide_zero_volume)
-
-            # Hidden fake/no-trade bars can stay in the raw file with volume 0, but they must not
-            # enter the runner stream. BITGET/Hyperliquid leave hide_zero_volume=False, so their
-            # 0-volume bars still take this visible path.
-            confirmed_appended = False
-            if confirmed_visible:
-                try:
-                    ctx.stream.replace_last(confirmed_ohlcv)
-                except IndexError:
-                    ctx.stream.append(confirmed_ohlcv)
-                    confirmed_appended = True
-                if new_visible:
-                    ctx.stream.append(new_ohlcv)
-            ctx.stream.finish()
-
-            # Count only visible bars added to the runner's index space.
-            timeframe_ms = parse_timeframe_to_ms(tf)
-            interval_ms = (int(new_ohlcv.timestamp) - int(ctx.last_new_bar_ts_sec)) * 1000
-            # last_bar_index tracks visible bars. If pre_run skipped a hidden fake open bar,
-            # the confirmed bar may be appended as a new visible bar here.
-            confirmed_increment = 1 if confirmed_appended else 0
-            new_increment = 1 if interval_ms == timeframe_ms and new_visible else 0
-            incremented_size = confirmed_increment + new_increment
-
-            if confirmed_visible:
-                # #################################### Module calculation ####################################
-                # # bb1d / weekly high, low calculation
-                # from modules.bb1d_calc import get_bb1d_lower
-                # from modules.weekly_hl_calc import get_weekly_high_low
-                # bb1d_lower = get_bb1d_lower(ohlcv_path, period=20, mult=2.0, lookahead_on=True)
-                # macro_high, macro_low = get_weekly_high_low(ohlcv_path, ago=2, session_offset_hours=9,
-                #                                             lookahead_on=True)
-                # #################################### Module calculation ####################################
-
-                # custom input update
-                ctx.runner.script.custom_inputs = {
-                    # "bb1d_lower": bb1d_lower,
-                    # "macro_high": macro_high,
-                    # "macro_low": macro_low
-                }
-
-                if incremented_size > 0:
-                    ctx.runner.last_bar_index += incremented_size
-                    ctx.runner.script.last_bar_index += incremented_size
-
-                # The confirmed bar index is the visible index just evaluated. When a visible
-                # new bar was appended, last_bar_index already points to that new open bar.
-                confirmed_bar_index = ctx.runner.last_bar_index - new_increment
-                # Strategy code uses strategy.last_bar_index() - 1 as the "last confirmed bar"
-                # check in realtime mode. If the next OKX open bar is hidden, it is not appended
-                # to the stream, but the confirmed bar should still satisfy that check.
-                if not new_visible:
-                    ctx.runner.script.last_bar_index = confirmed_bar_index + 1
-
-                # Ensure request.security can see the new bar during confirmed-bar evaluation.
-                from pynecore.lib.request import get_security_ctx
-                security_ctx = get_security_ctx()
-                if security_ctx is not None:
-                    security_ctx.update_base_bar(confirmed_ohlcv, confirmed_bar_index)
-                    if new_visible:
-                        security_ctx.update_base_bar(new_ohlcv, ctx.runner.last_bar_index)
-
-                # Calculate the last confirmed bar
-                ctx.runner.script.pre_run = False
-                while True:
-                    step_res = ctx.runner.step()
-                    if step_res is None:
-                        break
-
-                # Hidden-bar fix:
-                # 새로 열린 봉이 volume 0 hidden bar 면 new_ohlcv 가 stream 에 append 되지
-                # 않아(line 619-620) confirmed bar 의 main() 에서 접수된 주문을 체결할
-                # process_orders() 패스가 없어 webhook alert 이 나가지 않는다. fake bar 의
-                # open(=직전 종가)으로 대기 주문만 체결시켜 alert 을 발생시킨다. main() 은
-                # 호출하지 않는다 (hidden bar 는 전략 로직/visible bar_index 에 들어가면 안 됨).
-                # script.last_bar_index 는 위에서 confirmed_bar_index + 1 로 맞춰져 있어
-                # realtime alert 게이트(order.bar_index == last_bar_index() - 1)가 성립한다.
-                # BITGET/Hyperliquid 는 new_visible=True 라 기존 new bar step 경로를 그대로 탄다.
-                if not new_visible and ctx.runner.script.position is not None:
-                    from pynecore import lib
-                    from pynecore.core.script_runner import _set_lib_properties
-                    _set_lib_properties(new_ohlcv, confirmed_bar_index + 1,
-                                        ctx.runner.tz, lib)
-                    # Fill the pending order on the fake bar so the webhook alert fires
-                    # AND the chart trade marker is emitted in real time (pre_run is False
-                    # here). The duplicate that prerun replay would otherwise create (it
-                    # re-fills on the next visible bar) is prevented by pre_run-gating the
-                    # trade-event callbacks (see on_entry_event/on_close_event): only this
-                    # real-time fill emits a marker, prerun replay does not re-emit.
-                    ctx.runner.script.position.process_orders()
-
-                # Send trade events to data_service
-                if trade_event_queue:
+                    runner, stream, reader = result
+                    result = None
+
+                # print("=== Pre-run start (up to the last bar) ===")
+                size = runner.last_bar_index + 1
+                last_visible_bar = get_runner_candle(runner, runner.last_bar_index)
+                # In normal realtime pre-run, the file may already contain the open current bar.
+                # If that bar is visible, keep it in the stream for the next run_ready and
+                # pre-run only up to the last confirmed bar. If the raw last bar is a
+                # hidden zero-volume candle, the visible list already ends at a confirmed bar.
+                has_unconfirmed_visible_bar = (
+                    last_visible_bar is not None
+                    and reader.end_timestamp is not None
+                    and int(last_visible_bar.timestamp) == int(reader.end_timestamp)
+                )
+                prerun_range = size - 1 if has_unconfirmed_visible_bar else size
+                runner.script.pre_run = True
+                if mtype == "prerun_ready_after_history_download":
+                    prerun_range = size
+                    runner.script.pre_run = False
+                elif pending_full_reemit:
+                    # Fresh connection (runner restart/reconnect) or mid-run script edit:
+                    # trades_history was (or may have been) cleared, and trade-event callbacks
+                    # are pre_run-gated, so a normal (pre_run=True) prerun would NOT re-emit
+                    # the historical markers, leaving the chart empty until a restart. Run this
+                    # one prerun with pre_run=False so the gated callbacks re-emit all historical
+                    # markers. prerun_range stays size-1: the last open bar is still left for
+                    # run_ready, so no spurious last-bar alert fires (its fill bar isn't stepped).
+                    runner.script.pre_run = False
+                await asyncio.to_thread(run_prerun_steps, runner, prerun_range)
+                pending_full_reemit = False
+
+                # First pre_run done -> tell the hub the chart plots are ready (LED green).
+                if not ready_sent:
                     try:
-                        await ws.send(json.dumps(list(trade_event_queue)))
-                        trade_event_queue.clear()
+                        await ws.send(RUNNER_READY_FRAME)
+                        ready_sent = True
                     except Exception as e:
-                        print(f"[runner] Failed to send trade events: {e}")
+                        print(f"[runner] Failed to send runner_ready: {e}")
+                # print("=== Pre-run finished ===")
 
-                # Send plotchar events to data_service
-                if plotchar_event_queue:
-                    try:
-                        await ws.send(json.dumps(list(plotchar_event_queue)))
-                        plotchar_event_queue.clear()
-                    except Exception as e:
-                        print(f"[runner] Failed to send plotchar events: {e}")
+                try:
+                    title = runner.script.title or "No title"
+                    await ws.send(script_info_frame(script_path, title))
+                except Exception as e:
+                    print(f"[runner] Failed to send script_info: {e}")
 
-                # Send plot options to data_service
-                if plot_options:
+                # Send the visible last candle itself. A visible index can differ from the
+                # raw file index when OKX hidden zero-volume bars exist.
+                try:
+                    last_bar = get_runner_candle(runner, runner.last_bar_index)
+                    event = {
+                        "type": "last_bar_open_fix",
+                        "last_bar_index": runner.last_bar_index,
+                    }
+                    if last_bar is not None:
+                        event["data"] = ohlcv_open_fix_event_data(last_bar)
+                    await ws.send(encode_json(event))
+                except Exception as e:
+                    print(f"[runner] Failed to send bar confirmation: {e}")
+
+                # Send trade/plotchar events and plot options to data_service in one message.
+                # Plot CSV rows are keyed by candle timestamp. Timestamp lookup avoids
+                # using a raw file index that may include hidden OKX bars.
+                confirmed_bar_index = runner.last_bar_index - 1
+                confirmed_bar = get_runner_candle(runner, confirmed_bar_index) if plot_options else None
+                confirmed_bar_time = int(confirmed_bar.timestamp) if confirmed_bar is not None else None
+                await flush_events(ws, confirmed_bar_index, confirmed_bar_time)
+
+                if mtype == "prerun_ready":
+                    # confirmed_bar_and_new_bar가 있다면 new bar ts를 추적에 사용
+                    confirmed_bar_and_new_bar = msg.get("confirmed_bar_and_new_bar")
+                    # print(f"[runner] pre_run confirmed_bar_and_new_bar: {confirmed_bar_and_new_bar}")
+                    # print(f"[runner] stream last: {stream.q[-1]}")
+                    last_new_ts_sec = 0
+                    if isinstance(confirmed_bar_and_new_bar, list) and len(confirmed_bar_and_new_bar) == 2:
+                        last_new_ts_sec = int(confirmed_bar_and_new_bar[1][0] / 1000)
+                    else:
+                        # fallback: Use end_timestamp from the file, through the reader that
+                        # ready_scrip_runner left open on it
+                        last_new_ts_sec = int(reader.end_timestamp)
+
+                    ctx = RunnerCtx(runner=runner, stream=stream, reader=reader, last_new_bar_ts_sec=last_new_ts_sec)
+                    # print(f"[runner] prerun done. last_new_bar_ts_sec={ctx.last_new_bar_ts_sec}")
+                elif mtype == "prerun_ready_after_history_download":
+                    runner.destroy()
+                    stream.finish()
+                    stream = None
+                    reader.close()
+
+            # -----------------------------
+            # Script run stage
+            # -----------------------------
+            elif mtype == "run_ready":
+                if ctx is None:
+                    continue
+
+                ohlcv_path = msg.get("ohlcv_path", "")
+                confirmed_bar_and_new_bar = msg.get("confirmed_bar_and_new_bar")
+                # print(f"[runner] run_ready confirmed_bar_and_new_bar: {confirmed_bar_and_new_bar}")
+                confirmed_bar = confirmed_bar_and_new_bar[0]
+                new_bar = confirmed_bar_and_new_bar[1]
+
+                confirmed_ohlcv = bar_list_to_ohlcv(confirmed_bar)
+                new_ohlcv = bar_list_to_ohlcv(new_bar)
+                hide_zero_volume = hide_zero_volume_bars(getattr(ctx.runner.syminfo, "prefix", None))
+                # confirmed_visible decides whether this just-closed candle should run one strategy step.
+                # new_visible decides whether the newly opened candle should be kept as the next open bar.
+                confirmed_visible = is_visible_ohlcv(confirmed_ohlcv, hide_zero_volume=hide_zero_volume)
+                new_visible = is_visible_ohlcv(new_ohlcv, hide_zero_volume=hide_zero_volume)
+
+                # Hidden fake/no-trade bars can stay in the raw file with volume 0, but they must not
+                # enter the runner stream. BITGET/Hyperliquid leave hide_zero_volume=False, so their
+                # 0-volume bars still take this visible path.
+                confirmed_appended = False
+                if confirmed_visible:
                     try:
-                        plot_options_event = {
-                            "type": "plot_options",
-                            "data": plot_options,
-                            "confirmed_bar_index": confirmed_bar_index,
-                            "confirmed_bar_time": int(confirmed_ohlcv.timestamp),
-                        }
-                        await ws.send(json.dumps(plot_options_event))
-                        # print(f"[runner] Sent plot_options: {plot_options}")
-                    except Exception as e:
-                        print(f"[runner] Failed to send plot options: {e}")
+                        ctx.stream.replace_last(confirmed_ohlcv)
+                    except IndexError:
+                        ctx.stream.append(confirmed_ohlcv)
+                        confirmed_appended = True
+                    if new_visible:
+                        ctx.stream.append(new_ohlcv)
+                ctx.stream.finish()
+
+                # Count only visible bars added to the runner's index space.
+                interval_ms = (int(new_ohlcv.timestamp) - int(ctx.last_new_bar_ts_sec)) * 1000
+                # last_bar_index tracks visible bars. If pre_run skipped a hidden fake open bar,
+                # the confirmed bar may be appended as a new visible bar here.
+                confirmed_increment = 1 if confirmed_appended else 0
+                new_increment = 1 if interval_ms == timeframe_ms and new_visible else 0
+                incremented_size = confirmed_increment + new_increment
+
+                if confirmed_visible:
+                    # #################################### Module calculation ####################################
+                    # # bb1d / weekly high, low calculation
+                    # from modules.bb1d_calc import get_bb1d_lower
+                    # from modules.weekly_hl_calc import get_weekly_high_low
+                    # bb1d_lower = get_bb1d_lower(ohlcv_path, period=20, mult=2.0, lookahead_on=True)
+                    # macro_high, macro_low = get_weekly_high_low(ohlcv_path, ago=2, session_offset_hours=9,
+                    #                                             lookahead_on=True)
+                    # #################################### Module calculation ####################################
+
+                    # custom input update
+                    ctx.runner.script.custom_inputs = {
+                        # "bb1d_lower": bb1d_lower,
+                        # "macro_high": macro_high,
+                        # "macro_low": macro_low
+                    }
 
-            # Remove the script_module using destroy() (required). If you don't remove it,
-            # the ScriptRunner will reuse the previous candle data even when reloading the script.
-            ctx.runner.destroy()
-            ctx.stream = None
-            ctx.reader.close()
-            ctx = None
+                    if incremented_size > 0:
+                        ctx.runner.last_bar_index += incremented_size
+                        ctx.runner.script.last_bar_index += incremented_size
+
+                    # The confirmed bar index is the visible index just evaluated. When a visible
+                    # new bar was appended, last_bar_index already points to that new open bar.
+                    confirmed_bar_index = ctx.runner.last_bar_index - new_increment
+                    # Strategy code uses strategy.last_bar_index() - 1 as the "last confirmed bar"
+                    # check in realtime mode. If the next OKX open bar is hidden, it is not appended
+                    # to the stream, but the confirmed bar should still satisfy that check.
+                    if not new_visible:
+                        ctx.runner.script.last_bar_index = confirmed_bar_index + 1
+
+                    # Ensure request.security can see the new bar during confirmed-bar evaluation.
+                    from pynecore.lib.request import get_security_ctx
+                    security_ctx = get_security_ctx()
+                    if security_ctx is not None:
+                        security_ctx.update_base_bar(confirmed_ohlcv, confirmed_bar_index)
+                        if new_visible:
+                            security_ctx.update_base_bar(new_ohlcv, ctx.runner.last_bar_index)
+
+                    # Calculate the last confirmed bar
+                    ctx.runner.script.pre_run = False
+                    while True:
+                        step_res = ctx.runner.step()
+                        if step_res is None:
+                            break
+
+                    # Hidden-bar fix:
+                    # 새로 열린 봉이 volume 0 hidden bar 면 new_ohlcv 가 stream 에 append 되지
+                    # 않아(line 619-620) confirmed bar 의 main() 에서 접수된 주문을 체결할
+                    # process_orders() 패스가 없어 webhook alert 이 나가지 않는다. fake bar 의
+                    # open(=직전 종가)으로 대기 주문만 체결시켜 alert 을 발생시킨다. main() 은
+                    # 호출하지 않는다 (hidden bar 는 전략 로직/visible bar_index 에 들어가면 안 됨).
+                    # script.last_bar_index 는 위에서 confirmed_bar_index + 1 로 맞춰져 있어
+                    # realtime alert 게이트(order.bar_index == last_bar_index() - 1)가 성립한다.
+                    # BITGET/Hyperliquid 는 new_visible=True 라 기존 new bar step 경로를 그대로 탄다.
+                    if not new_visible and ctx.runner.script.position is not None:
+                        from pynecore import lib
+                        from pynecore.core.script_runner import _set_lib_properties
+                        _set_lib_properties(new_ohlcv, confirmed_bar_index + 1,
+                                            ctx.runner.tz, lib)
+                        # Fill the pending order on the fake bar so the webhook alert fires
+                        # AND the chart trade marker is emitted in real time (pre_run is False
+                        # here). The duplicate that prerun replay would otherwise create (it
+                        # re-fills on the next visible bar) is prevented by pre_run-gating the
+                        # trade-event callbacks (see on_entry_event/on_close_event): only this
+                        # real-time fill emits a marker, prerun replay does not re-emit.
+                        ctx.runner.script.position.process_orders()
+
+                    # Send trade/plotchar events and plot options to data_service in one message
+                    await flush_events(ws, confirmed_bar_index, int(confirmed_ohlcv.timestamp))
+
+                # Remove the script_module using destroy() (required). If you don't remove it,
+                # the ScriptRunner will reuse the previous candle data even when reloading the script.
+                ctx.runner.destroy()
+                ctx.stream = None
+                ctx.reader.close()
+                ctx = None
 
-        else:
-            continue
+            else:
+                continue
+    finally:
+        # Stop reconnecting together with main()
+        reader_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await reader_task
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Run on the libuv event loop if uvloop is installed (not available on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+import ast
 import csv
 import hashlib
+from functools import lru_cache
 from pathlib import Path
 
+# Last loaded/written hashes per hash file, with the file's (size, mtime_ns) at that time.
+# The file is checked on every (re)connect and prerun, but it only changes when we write it.
+_hash_file_cache: dict[Path, tuple[tuple[int, int], dict[str, str]]] = {}
+# Digest of each imported module file, with its (size, mtime_ns) when it was hashed
+_digest_cache: dict[Path, tuple[tuple[int, int], str]] = {}
+
+
+def _file_key(hash_path: Path) -> tuple[int, int]:
+    st = hash_path.stat()
+    return st.st_size, st.st_mtime_ns
+
 
 def load_script_hashes(hash_path: Path | None) -> dict[str, str]:
-    if not hash_path or not hash_path.exists():
+    if not hash_path:
         return {}
+    try:
+        key = _file_key(hash_path)
+    except OSError:
+        return {}
+    cached = _hash_file_cache.get(hash_path)
+    if cached is not None and cached[0] == key:
+        return dict(cached[1])
     hashes: dict[str, str] = {}
     try:
         with hash_path.open("r", newline="") as f:
@@ -18,7 +38,8 @@ def load_script_hashes(hash_path: Path | None) -> dict[str, str]:
                 hashes[row[0]] = row[1]
     except Exception:
         return {}
-    return hashes
+    _hash_file_cache[hash_path] = (key, hashes)
+    return dict(hashes)
 
 
 def write_script_hashes(hash_path: Path | None, hashes: dict[str, str]) -> None:
@@ -28,6 +49,34 @@ def write_script_hashes(hash_path: Path | None, hashes: dict[str, str]) -> None:
         writer = csv.writer(f)
         for path, digest in sorted(hashes.items()):
             writer.writerow([path, digest])
+    _hash_file_cache[hash_path] = (_file_key(hash_path), dict(hashes))
+
+
+@lru_cache(maxsize=4)
+def _scan_import_names(main_text: str) -> frozenset[str]:
+    """Names of the modules imported by the script, scanned once per script source."""
+    import_names: set[str] = set()
+    try:
+        tree = ast.parse(main_text)
+    except SyntaxError:
+        # Not parsable (e.g. mid-edit): fall back to scanning the import lines
+        for line in main_text.splitlines():
+            stripped = line.strip()
+            if stripped.startswith("import "):
+                names = stripped[len("import "):].split(",")
+                for name in names:
+                    import_names.add(name.strip().split()[0])
+            elif stripped.startswith("from "):
+                parts = stripped.split()
+                if len(parts) >= 4 and parts[2] == "import":
+                    import_names.add(parts[1])
+        return frozenset(import_names)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            import_names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            import_names.add(node.module)
+    return frozenset(import_names)
 
 
 def compute_script_hashes(script_path: Path | None) -> dict[str, str]:
@@ -36,29 +85,35 @@ def compute_script_hashes(script_path: Path | None) -> dict[str, str]:
     script_dir = script_path.parent
     hashes: dict[str, str] = {}
     try:
-        main_text = script_path.read_text(encoding="utf-8")
+        main_content = script_path.read_bytes()
+        main_text = main_content.decode("utf-8")
     except Exception:
+        main_content = None
         main_text = ""
-    import_names: set[str] = set()
-    for line in main_text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("import "):
-            names = stripped[len("import "):].split(",")
-            for name in names:
-                import_names.add(name.strip().split()[0])
-        elif stripped.startswith("from "):
-            parts = stripped.split()
-            if len(parts) >= 4 and parts[2] == "import":
-                import_names.add(parts[1])
+    import_names = set(_scan_import_names(main_text))
     # Always include the main script itself.
     import_names.add(script_path.stem)
     for name in sorted(import_names):
         py_file = script_dir / f"{name}.py"
-        if not py_file.exists():
+        if py_file == script_path and main_content is not None:
+            # The main script is always hashed, from the bytes already read above
+            hashes[str(py_file)] = hashlib.sha256(main_content).hexdigest()
+            continue
+        try:
+            key = _file_key(py_file)
+        except OSError:
+            continue
+        # Unchanged size and mtime: reuse the digest instead of reading the file again
+        cached = _digest_cache.get(py_file)
+        if cached is not None and cached[0] == key:
+            hashes[str(py_file)] = cached[1]
             continue
         try:
-            content = py_file.read_bytes()
+            # Stream the file through the hasher instead of holding a copy of its bytes
+            with py_file.open("rb", buffering=0) as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
         except Exception:
             continue
-        hashes[str(py_file)] = hashlib.sha256(content).hexdigest()
+        _digest_cache[py_file] = (key, digest)
+        hashes[str(py_file)] = digest
     return hashes
@@ -6,17 +6,30 @@ from pynecore.lib import script, close, ta, strategy, time, plot, color, na, plo
     log, bar_index, is_na
 from pynecore.types import Series
 
+# Minimum time between the last take profit and a new entry, and time a position is held (2 minutes)
+COOLDOWN_MS = 2 * 60 * 1000
+HOLD_MS = 2 * 60 * 1000
+
 
 @script.strategy("test", overlay=True)
 def main():
     # -------------------------------------------------------------
     # Custom Inputs
     # -------------------------------------------------------------
+    # Read on every bar: the realtime runner replaces the custom inputs before each confirmed bar
+    customInputs: dict = strategy.get_custom_inputs() or {}
     # # bb1d / weekly high, low calculation
-    # custom_inputs: dict = strategy.get_custom_inputs()
-    # bb1d_lower: list[float] = custom_inputs.get('bb1d_lower', []) if custom_inputs is not {} else []
-    # macro_high: list[float] = custom_inputs.get('macro_high', []) if custom_inputs is not {} else []
-    # macro_low: list[float] = custom_inputs.get('macro_low', []) if custom_inputs is not {} else []
+    # bb1d_lower: np.ndarray = customInputs.get('bb1d_lower', [])
+    # macro_high: np.ndarray = customInputs.get('macro_high', [])
+    # macro_low: np.ndarray = customInputs.get('macro_low', [])
+
+    # Strategy parameters, overridable for parameter sweeps, e.g. one process per parameter set:
+    # run_many(script_path, [(data_path, {"custom_inputs": {"rsi_threshold": t}}) for t in (60, 65, 70)])
+    # No realtime caller changes them, so they are unpacked once (non-literal Persistent
+    # initializers run only on the first bar)
+    rsiThreshold: Persistent[float] = customInputs.get("rsi_threshold", 70)
+    cooldownMs: Persistent[int] = customInputs.get("cooldown_ms", COOLDOWN_MS)
+    holdMs: Persistent[int] = customInputs.get("hold_ms", HOLD_MS)
 
     rsi: Series[float] = ta.rsi(close, 14)
     entered1: Persistent[bool] = False
@@ -30,7 +43,8 @@ def main():
     _, _, bb_5_lower = request.security(syminfo.tickerid, '5', ta.bb(close, 20, 2), lookahead=barmerge.lookahead_on)
 
     # Execute the strategy
-    if not entered1 and rsi < 70 and (time - lastTpTime) >= 1 * 60 * 1000 * 2:
+    # Cheap state checks first, ta.rsi is still updated on every bar above
+    if not entered1 and (time - lastTpTime) >= cooldownMs and rsi < rsiThreshold:
         entered1 = True
         entered1Time = time
         avgEntry = close
@@ -38,10 +52,10 @@ def main():
         strategy.entry("Long 1", strategy.long, alert_message=f'{{"signal": "Long 1", "price": {close}}}',
                        comment=f"Long 1 at rsi: {rsi}", record=False)
 
-    if entered1 and (time - entered1Time) >= 1 * 60 * 1000 * 2:
+    if entered1 and (time - entered1Time) >= holdMs:
         entered1 = False
         lastTpTime = time
-        strategy.close("Long 1", alert_message=f'{{"signal": "Close 1"}}',
+        strategy.close("Long 1", alert_message='{"signal": "Close 1"}',
                         comment=f"Close 1 at price: {close}", record=False)
 
     # Plot Example